@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List
 from pydantic import BaseModel
@@ -6,10 +7,11 @@ from pydantic import BaseModel
 from database import get_db
 from models.project import Project
 from models.task import Task
-from services.ai_service import AIService
+from services.ai_service import get_ai_service
+from services.ollama_utils import dumps_json
 
 router = APIRouter(tags=["suggestions"])
-ai_service = AIService()
+ai_service = get_ai_service()
 
 class SuggestionResponse(BaseModel):
     title: str
@@ -38,6 +40,21 @@ async def get_project_suggestions(project_id: int, db: Session = Depends(get_db)
         )
     ]
 
+@router.get("/suggestions/{project_id}/stream")
+async def stream_project_suggestions(project_id: int, db: Session = Depends(get_db)):
+    """Stream AI suggestions for a project as server-sent events, one per suggestion"""
+    project = db.query(Project).filter(Project.id == project_id).first()
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    async def event_stream():
+        async for suggestion in ai_service.stream_project_suggestions(
+            project.title, project.description, project.location, project.next_action
+        ):
+            yield b"data: " + dumps_json(suggestion) + b"\n\n"
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
 @router.get("/ai/health")
 async def check_ai_health():
     """Check if Ollama and the AI model are available"""
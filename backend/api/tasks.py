@@ -155,7 +155,7 @@ async def delete_task(task_id: int, db: Session = Depends(get_db)):
 @router.post("/tasks/{task_id}/split", response_model=TaskSplitResponse)
 async def split_task(task_id: int, db: Session = Depends(get_db)):
     """Split a task into smaller tasks using AI assistance"""
-    from services.ai_service import AIService
+    from services.ai_service import get_ai_service
     
     # Get the original task
     db_task = db.query(Task).filter(Task.id == task_id).first()
@@ -163,7 +163,7 @@ async def split_task(task_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Task not found")
     
     # Use AI service to generate subtasks
-    ai_service = AIService()
+    ai_service = get_ai_service()
     try:
         suggested_subtasks = await ai_service.split_task_into_subtasks(task_id, db)
         
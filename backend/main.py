@@ -1,5 +1,6 @@
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from dotenv import load_dotenv
 from sqlalchemy.orm import Session
 import os
@@ -9,11 +10,13 @@ load_dotenv()
 
 # Import database setup
 from database import create_tables, get_db
+from services.ollama_utils import ORJSON_AVAILABLE
 
 app = FastAPI(
     title="Motivate.AI API",
     description="AI-guided project companion backend",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
 )
 
 # Create database tables on startup
@@ -21,6 +24,12 @@ app = FastAPI(
 async def startup_event():
     create_tables()
 
+# Close the shared Ollama connection pool on shutdown
+@app.on_event("shutdown")
+async def shutdown_event():
+    from services.ai_service import get_ai_service
+    await get_ai_service().aclose()
+
 # Configure CORS for frontend access
 app.add_middleware(
     CORSMiddleware,
@@ -1,3 +1,3 @@
-from .ai_service import AIService
+from .ai_service import AIService, get_ai_service
 
-__all__ = ["AIService"] 
\ No newline at end of file
+__all__ = ["AIService", "get_ai_service"] 
\ No newline at end of file
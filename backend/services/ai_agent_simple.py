@@ -8,6 +8,8 @@ Uses a simple state machine instead of LangGraph to avoid dependency conflicts.
 
 import os
 import json
+import asyncio
+import logging
 import httpx
 from typing import Dict, List, Any, Optional, Callable
 from datetime import datetime
@@ -17,11 +19,53 @@ from dotenv import load_dotenv
 import sys
 from pathlib import Path
 
+from services.ollama_utils import dumps_json, extract_json_object, extract_response_text, loads_json, request_key
+
 # Load environment from shared config
 shared_config_path = Path(__file__).parent.parent.parent / "shared" / "config.env.example"
 load_dotenv(shared_config_path)
 load_dotenv()  # Also load any local .env file
 
+logger = logging.getLogger(__name__)
+
+# Ollama sampling options, shared across calls and never mutated
+_ANALYSIS_OPTIONS = {"temperature": 0.3, "top_p": 0.9}  # Lower temperature for more focused analysis
+_RETRY_OPTIONS = {"temperature": 0.1, "top_p": 0.8}  # More focused settings for the retry
+
+# Static parts of the retry prompt, split around the original task id
+_SIMPLE_PROMPT_HEADER = "Split this task into 2-5 smaller subtasks. Return JSON only:\n\n"
+_SIMPLE_SCHEMA_PREFIX = """
+
+{
+  "task_splits": [{
+    "original_task_id": """
+_SIMPLE_SCHEMA_SUFFIX = """,
+    "subtasks": [{
+      "title": "Step name",
+      "description": "What to do",
+      "estimated_minutes": 10,
+      "priority": "medium",
+      "energy_level": "medium",
+      "context": "when you have time",
+      "project_id": "INHERIT_FROM_ORIGINAL_TASK"
+    }],
+    "split_rationale": "Why split this way"
+  }],
+  "confidence_score": 0.8,
+  "reasoning_steps": ["Quick reasoning"]
+}"""
+
+
+def _build_simple_prompt(task_ids: List[int], task_summaries: List[str]) -> str:
+    """Build the retry prompt; only called once the inputs have been validated"""
+    return "".join((
+        _SIMPLE_PROMPT_HEADER,
+        "; ".join(task_summaries),
+        _SIMPLE_SCHEMA_PREFIX,
+        str(task_ids[0]),
+        _SIMPLE_SCHEMA_SUFFIX,
+    ))
+
 
 class OperationType(Enum):
     """Supported AI agent operations"""
@@ -88,6 +132,9 @@ class AIAgent:
         self.model = os.getenv("AI_MODEL", "qwen3max:latest")
         self.timeout = int(os.getenv("OLLAMA_TIMEOUT", "600"))
         
+        # Generate requests currently awaiting Ollama, keyed by request_key()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        
         # Initialize tools
         self.tools = self._create_tools()
     
@@ -265,7 +312,7 @@ class AIAgent:
                     
                 except Exception as db_error:
                     # Fallback to HTTP if database access fails
-                    print(f"Database access failed, falling back to HTTP: {str(db_error)}")
+                    logger.warning("Database access failed, falling back to HTTP: %s", db_error)
                     response = httpx.post(
                         f"{self.api_base_url}/tasks/bulk",
                         json={"tasks": tasks_json},
@@ -298,7 +345,7 @@ class AIAgent:
                     
                 except Exception as db_error:
                     # Fallback to HTTP if database access fails
-                    print(f"Database delete failed, falling back to HTTP: {str(db_error)}")
+                    logger.warning("Database delete failed, falling back to HTTP: %s", db_error)
                     response = httpx.delete(f"{self.api_base_url}/tasks/{task_id}", timeout=self.timeout)
                     if response.status_code == 200:
                         return f"Task {task_id} deleted successfully"
@@ -363,7 +410,7 @@ class AIAgent:
                     return json.dumps(task_dict, indent=2)
                     
                 except Exception as db_error:
-                    print(f"Database update failed, trying HTTP fallback: {db_error}")
+                    logger.warning("Database update failed, trying HTTP fallback: %s", db_error)
                     # Fallback to HTTP request
                     with httpx.Client(timeout=self.timeout) as client:
                         response = client.put(
@@ -412,6 +459,47 @@ class AIAgent:
             }
         ]
     
+    async def _generate(self, prompt: str, options: Dict[str, Any], timeout: Optional[float] = None) -> str:
+        """Run a generate request against Ollama and return the response text.
+        
+        Identical concurrent requests are coalesced: callers arriving while a
+        matching request is in flight await its result instead of starting
+        another inference.
+        """
+        key = request_key(self.model, prompt, options)
+        task = self._inflight.get(key)
+        if task is None:
+            # The request runs in its own task, so cancelling any one caller
+            # (the first included) never cancels it for the others
+            task = asyncio.create_task(self._post_generate(prompt, options, timeout))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._request_done(key, done))
+        return await asyncio.shield(task)
+    
+    def _request_done(self, key: str, task: asyncio.Task) -> None:
+        """Forget a finished generate request"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark any exception as retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+    
+    async def _post_generate(self, prompt: str, options: Dict[str, Any], timeout: Optional[float]) -> str:
+        """Send one generate request to Ollama and return the response text"""
+        async with httpx.AsyncClient(timeout=timeout or self.timeout) as client:
+            response = await client.post(
+                f"{self.ollama_base_url}/api/generate",
+                content=dumps_json({
+                    "model": self.model,
+                    "prompt": prompt,
+                    "stream": False,
+                    "options": options
+                }),
+                headers={"content-type": "application/json"}
+            )
+            response.raise_for_status()
+            return extract_response_text(response.content)
+    
     def _gather_data(self, state: AgentState) -> None:
         """Gather all necessary data for the operation"""
         operation = state.request.get("operation")
@@ -541,7 +629,7 @@ class AIAgent:
     
     def _execute_changes(self, state: AgentState) -> None:
         """Execute the approved changes"""
-        print("Starting task execution...")
+        logger.info("Starting task execution...")
         
         if not state.preview_approved:
             state.error = "Cannot execute changes without preview approval"
@@ -552,14 +640,14 @@ class AIAgent:
         
         try:
             if operation == OperationType.SPLIT_TASK.value:
-                print(f"Executing task splitting with {len(state.proposed_changes)} changes...")
+                logger.info("Executing task splitting with %d changes...", len(state.proposed_changes))
                 
                 # Execute task splitting
                 for i, change in enumerate(state.proposed_changes):
-                    print(f"Processing change {i+1}/{len(state.proposed_changes)}: {change['action']}")
+                    logger.debug("Processing change %d/%d: %s", i + 1, len(state.proposed_changes), change['action'])
                     
                     if change["action"] == "create_tasks":
-                        print(f"Creating {len(change['tasks'])} new tasks...")
+                        logger.info("Creating %d new tasks...", len(change['tasks']))
                         
                         # Ensure all tasks have project_id from original task
                         tasks_with_project_id = []
@@ -577,9 +665,9 @@ class AIAgent:
                             if not task_data.get("project_id") or task_data.get("project_id") == "INHERIT_FROM_ORIGINAL_TASK":
                                 if original_project_id:
                                     task_data["project_id"] = original_project_id
-                                    print(f"Set project_id {original_project_id} for task: {task_data.get('title', 'Untitled')}")
+                                    logger.debug("Set project_id %s for task: %s", original_project_id, task_data.get('title', 'Untitled'))
                                 else:
-                                    print(f"WARNING: No original project_id found for task: {task_data.get('title', 'Untitled')}")
+                                    logger.warning("No original project_id found for task: %s", task_data.get('title', 'Untitled'))
                             
                             tasks_with_project_id.append(task_data)
                         
@@ -589,10 +677,10 @@ class AIAgent:
                             "action": "created_tasks",
                             "result": result
                         })
-                        print("✓ Tasks created successfully")
+                        logger.info("Tasks created successfully")
                     
                     elif change["action"] == "delete_task":
-                        print(f"Deleting task {change['task_id']}...")
+                        logger.info("Deleting task %s...", change['task_id'])
                         delete_tool = next(t for t in self.tools if t["name"] == "delete_task")
                         result = delete_tool["func"](change["task_id"])
                         executed_changes.append({
@@ -600,25 +688,25 @@ class AIAgent:
                             "task_id": change["task_id"],
                             "result": result
                         })
-                        print("✓ Task deleted successfully")
+                        logger.info("Task deleted successfully")
                         
             elif operation == OperationType.IMPROVE_DESCRIPTION.value:
-                print(f"Executing description improvement with {len(state.proposed_changes)} changes...")
+                logger.info("Executing description improvement with %d changes...", len(state.proposed_changes))
                 
                 # Execute description improvement
                 for i, change in enumerate(state.proposed_changes):
-                    print(f"Processing change {i+1}/{len(state.proposed_changes)}: {change['action']}")
+                    logger.debug("Processing change %d/%d: %s", i + 1, len(state.proposed_changes), change['action'])
                     
                     if change["action"] == "update_task":
                         task_id = change["task_id"]
                         updates = change["updates"]
-                        print(f"Updating task {task_id} with updates: {updates}")
+                        logger.info("Updating task %s", task_id)
                         
                         # Show the new description length for debugging
-                        if "description" in updates:
+                        if "description" in updates and logger.isEnabledFor(logging.DEBUG):
                             new_desc = updates["description"]
-                            print(f"New description length: {len(new_desc)} characters")
-                            print(f"New description preview: {new_desc[:100]}...")
+                            logger.debug("New description length: %d characters", len(new_desc))
+                            logger.debug("New description preview: %s...", new_desc[:100])
                         
                         update_tool = next(t for t in self.tools if t["name"] == "update_task")
                         result = update_tool["func"](task_id, json.dumps(updates))
@@ -627,14 +715,15 @@ class AIAgent:
                         try:
                             result_data = json.loads(result) if isinstance(result, str) else result
                             if isinstance(result_data, dict) and result_data.get("id") == task_id:
-                                print(f"✓ CONFIRMED: Task {task_id} description updated in database")
-                                print(f"✓ New description length: {len(result_data.get('description', ''))}")
-                                print(f"✓ New description preview: {result_data.get('description', '')[:100]}...")
+                                logger.info("Task %s description updated in database", task_id)
+                                if logger.isEnabledFor(logging.DEBUG):
+                                    logger.debug("New description length: %d", len(result_data.get('description', '')))
+                                    logger.debug("New description preview: %s...", result_data.get('description', '')[:100])
                             else:
-                                print(f"⚠️  WARNING: Unexpected update result format: {result}")
+                                logger.warning("Unexpected update result format: %s", result)
                         except Exception as parse_error:
-                            print(f"⚠️  WARNING: Could not parse update result: {parse_error}")
-                            print(f"Raw result: {result}")
+                            logger.warning("Could not parse update result: %s", parse_error)
+                            logger.debug("Raw result: %s", result)
                         
                         executed_changes.append({
                             "action": "updated_task",
@@ -642,15 +731,16 @@ class AIAgent:
                             "updates": updates,
                             "result": result
                         })
-                        print(f"✓ Task description update completed. API response: {result[:200]}...")
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("Task description update completed. API response: %s...", result[:200])
             
             state.analysis["executed_changes"] = executed_changes
             state.execution_complete = True
             state.reasoning_chain.append("Successfully executed all proposed changes")
-            print("✓ All changes executed successfully!")
+            logger.info("All changes executed successfully")
             
         except Exception as e:
-            print(f"✗ Error during execution: {str(e)}")
+            logger.exception("Error during execution: %s", e)
             state.error = f"Error executing changes: {str(e)}"
     
     async def _analyze_task_splitting(self, gathered_data: Dict, request: Dict) -> Dict[str, Any]:
@@ -696,6 +786,10 @@ class AIAgent:
                                             - Existing Tasks: {len(all_tasks)} total tasks
                                             - Recent Tasks: {[t.get('title', 'N/A') for t in all_tasks[-3:] if not t.get('is_completed', False)]}""")
         
+        # Nothing to send to the model, skip building the prompt entirely
+        if not context_parts:
+            return self._fallback_task_analysis(gathered_data, task_ids)
+        
         context_text = "\n".join(context_parts)
         
         prompt = f"""You are an expert productivity consultant analyzing tasks for optimal splitting.
@@ -745,114 +839,73 @@ class AIAgent:
                     """
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.ollama_base_url}/api/generate",
-                    json={
-                        "model": self.model,
-                        "prompt": prompt,
-                        "stream": False,
-                        "options": {
-                            "temperature": 0.3,  # Lower temperature for more focused analysis
-                            "top_p": 0.9
-                        }
-                    }
-                )
+            ai_response = await self._generate(prompt, _ANALYSIS_OPTIONS)
+            
+            # Strip thinking tags, markdown and extra text around the JSON object
+            clean_response = extract_json_object(ai_response)
+            analysis_data = loads_json(clean_response)
+            
+            # Convert to our format
+            proposed_changes = []
+            for split in analysis_data.get("task_splits", []):
+                original_task_id = split.get("original_task_id")
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    ai_response = result.get("response", "")
-                    
-                    # Enhanced cleaning and parsing of AI response
-                    clean_response = ai_response.strip()
-                    
-                    # Remove thinking tags for reasoning models
-                    if "<think>" in clean_response and "</think>" in clean_response:
-                        start = clean_response.find("</think>") + len("</think>")
-                        clean_response = clean_response[start:].strip()
-                    
-                    # Remove any leading/trailing markdown
-                    if clean_response.startswith("```json"):
-                        clean_response = clean_response[7:]
-                    elif clean_response.startswith("```"):
-                        clean_response = clean_response[3:]
-                    if clean_response.endswith("```"):
-                        clean_response = clean_response[:-3]
-                    clean_response = clean_response.strip()
-                    
-                    # Try to extract JSON from response if there's extra text
-                    json_start = clean_response.find("{")
-                    json_end = clean_response.rfind("}") + 1
-                    if json_start >= 0 and json_end > json_start:
-                        clean_response = clean_response[json_start:json_end]
-                    
-                    analysis_data = json.loads(clean_response)
-                    
-                    # Convert to our format
-                    proposed_changes = []
-                    for split in analysis_data.get("task_splits", []):
-                        original_task_id = split.get("original_task_id")
-                        
-                        # Add change to create new subtasks
-                        proposed_changes.append({
-                            "action": "create_tasks",
-                            "tasks": split.get("subtasks", []),
-                            "reasoning": split.get("split_rationale", "")
-                        })
-                        
-                        # Add change to delete original task
-                        if original_task_id:
-                            proposed_changes.append({
-                                "action": "delete_task",
-                                "task_id": original_task_id,
-                                "reasoning": f"Original task replaced by {len(split.get('subtasks', []))} subtasks"
-                            })
-                    
-                    return {
-                        "analysis": {
-                            "ai_analysis": analysis_data,
-                            "impact_assessment": analysis_data.get("impact_assessment", "Moderate impact"),
-                            "recommendations": analysis_data.get("recommendations", [])
-                        },
-                        "proposed_changes": proposed_changes,
-                        "confidence_score": analysis_data.get("confidence_score", 0.7),
-                        "reasoning_steps": analysis_data.get("reasoning_steps", ["AI analysis completed"])
-                    }
+                # Add change to create new subtasks
+                proposed_changes.append({
+                    "action": "create_tasks",
+                    "tasks": split.get("subtasks", []),
+                    "reasoning": split.get("split_rationale", "")
+                })
                 
-                else:
-                    raise Exception(f"AI API error: {response.status_code}")
-                    
+                # Add change to delete original task
+                if original_task_id:
+                    proposed_changes.append({
+                        "action": "delete_task",
+                        "task_id": original_task_id,
+                        "reasoning": f"Original task replaced by {len(split.get('subtasks', []))} subtasks"
+                    })
+            
+            return {
+                "analysis": {
+                    "ai_analysis": analysis_data,
+                    "impact_assessment": analysis_data.get("impact_assessment", "Moderate impact"),
+                    "recommendations": analysis_data.get("recommendations", [])
+                },
+                "proposed_changes": proposed_changes,
+                "confidence_score": analysis_data.get("confidence_score", 0.7),
+                "reasoning_steps": analysis_data.get("reasoning_steps", ["AI analysis completed"])
+            }
+
         except httpx.ReadTimeout as e:
-            print(f"AI analysis timeout after {self.timeout}s - Error: {str(e)}")
-            print(f"Consider increasing OLLAMA_TIMEOUT for complex reasoning tasks")
+            logger.warning("AI analysis timeout after %ss: %s", self.timeout, e)
+            logger.info("Consider increasing OLLAMA_TIMEOUT for complex reasoning tasks")
             
             # For timeouts, try a simpler prompt with retry
             return await self._retry_with_simpler_prompt(gathered_data, task_ids)
             
         except httpx.ConnectTimeout as e:
-            print(f"AI connection timeout - Error: {str(e)}")
-            print("Check if Ollama is running and accessible")
+            logger.warning("AI connection timeout: %s", e)
+            logger.info("Check if Ollama is running and accessible")
             return self._fallback_task_analysis(gathered_data, task_ids)
             
         except json.JSONDecodeError as e:
-            print(f"AI response parsing failed - Error: {str(e)}")
+            logger.warning("AI response parsing failed: %s", e)
             
             # If we got a response but parsing failed, log the raw response
-            if 'ai_response' in locals():
-                print(f"Raw AI response (first 500 chars): {ai_response[:500]}...")
-                print(f"Clean response (first 500 chars): {clean_response[:500] if 'clean_response' in locals() else 'Not available'}...")
+            if 'ai_response' in locals() and logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Raw AI response (first 500 chars): %s...", ai_response[:500])
+                logger.debug("Clean response (first 500 chars): %s...", clean_response[:500] if 'clean_response' in locals() else 'Not available')
             
             return self._fallback_task_analysis(gathered_data, task_ids)
             
         except Exception as e:
             # Log the actual error before falling back
-            print(f"AI analysis failed - Error: {str(e)}")
-            print(f"Error type: {type(e).__name__}")
+            logger.exception("AI analysis failed (%s): %s", type(e).__name__, e)
             
             # If we got a response but parsing failed, log the raw response
-            if 'ai_response' in locals():
-                print(f"Raw AI response (first 500 chars): {ai_response[:500]}...")
-                print(f"Clean response (first 500 chars): {clean_response[:500] if 'clean_response' in locals() else 'Not available'}...")
+            if 'ai_response' in locals() and logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Raw AI response (first 500 chars): %s...", ai_response[:500])
+                logger.debug("Clean response (first 500 chars): %s...", clean_response[:500] if 'clean_response' in locals() else 'Not available')
             
             # Fallback analysis
             return self._fallback_task_analysis(gathered_data, task_ids)
@@ -874,84 +927,50 @@ class AIAgent:
         if not task_summaries:
             return self._fallback_task_analysis(gathered_data, task_ids)
         
-        simple_prompt = f"""Split this task into 2-5 smaller subtasks. Return JSON only:
-
-{'; '.join(task_summaries)}
-
-{{
-  "task_splits": [{{
-    "original_task_id": {task_ids[0]},
-    "subtasks": [{{
-      "title": "Step name",
-      "description": "What to do",
-      "estimated_minutes": 10,
-      "priority": "medium",
-      "energy_level": "medium",
-      "context": "when you have time",
-      "project_id": "INHERIT_FROM_ORIGINAL_TASK"
-    }}],
-    "split_rationale": "Why split this way"
-  }}],
-  "confidence_score": 0.8,
-  "reasoning_steps": ["Quick reasoning"]
-}}"""
+        simple_prompt = _build_simple_prompt(task_ids, task_summaries)
 
         try:
-            async with httpx.AsyncClient(timeout=60) as client:  # Shorter timeout for retry
-                response = await client.post(
-                    f"{self.ollama_base_url}/api/generate",
-                    json={
-                        "model": self.model,
-                        "prompt": simple_prompt,
-                        "stream": False,
-                        "options": {"temperature": 0.1, "top_p": 0.8}  # More focused settings
-                    }
-                )
+            # Shorter timeout and more focused settings for the retry
+            ai_response = await self._generate(simple_prompt, _RETRY_OPTIONS, timeout=60)
+            
+            # Simple JSON extraction
+            clean_response = extract_json_object(ai_response)
+            if clean_response.startswith("{"):
+                analysis_data = loads_json(clean_response)
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    ai_response = result.get("response", "").strip()
+                # Convert to our format
+                proposed_changes = []
+                for split in analysis_data.get("task_splits", []):
+                    proposed_changes.append({
+                        "action": "create_tasks",
+                        "tasks": split.get("subtasks", []),
+                        "reasoning": split.get("split_rationale", "")
+                    })
                     
-                    # Simple JSON extraction
-                    json_start = ai_response.find("{")
-                    json_end = ai_response.rfind("}") + 1
-                    if json_start >= 0 and json_end > json_start:
-                        clean_response = ai_response[json_start:json_end]
-                        analysis_data = json.loads(clean_response)
-                        
-                        # Convert to our format
-                        proposed_changes = []
-                        for split in analysis_data.get("task_splits", []):
-                            proposed_changes.append({
-                                "action": "create_tasks",
-                                "tasks": split.get("subtasks", []),
-                                "reasoning": split.get("split_rationale", "")
-                            })
-                            
-                            if split.get("original_task_id"):
-                                proposed_changes.append({
-                                    "action": "delete_task",
-                                    "task_id": split.get("original_task_id"),
-                                    "reasoning": f"Replaced by {len(split.get('subtasks', []))} subtasks"
-                                })
-                        
-                        print("AI analysis succeeded on retry with simpler prompt")
-                        return {
-                            "analysis": {
-                                "ai_analysis": analysis_data,
-                                "impact_assessment": "Tasks split successfully",
-                                "retry_used": True
-                            },
-                            "proposed_changes": proposed_changes,
-                            "confidence_score": analysis_data.get("confidence_score", 0.7),
-                            "reasoning_steps": analysis_data.get("reasoning_steps", ["AI retry analysis"])
-                        }
-                        
+                    if split.get("original_task_id"):
+                        proposed_changes.append({
+                            "action": "delete_task",
+                            "task_id": split.get("original_task_id"),
+                            "reasoning": f"Replaced by {len(split.get('subtasks', []))} subtasks"
+                        })
+                
+                logger.info("AI analysis succeeded on retry with simpler prompt")
+                return {
+                    "analysis": {
+                        "ai_analysis": analysis_data,
+                        "impact_assessment": "Tasks split successfully",
+                        "retry_used": True
+                    },
+                    "proposed_changes": proposed_changes,
+                    "confidence_score": analysis_data.get("confidence_score", 0.7),
+                    "reasoning_steps": analysis_data.get("reasoning_steps", ["AI retry analysis"])
+                }
+
         except Exception as e:
-            print(f"Retry also failed: {str(e)}")
+            logger.warning("Retry also failed: %s", e)
         
         # Final fallback
-        print("Both AI attempts failed, using fallback analysis")
+        logger.warning("Both AI attempts failed, using fallback analysis")
         return self._fallback_task_analysis(gathered_data, task_ids)
     
     async def _analyze_description_improvement(self, gathered_data: Dict, request: Dict) -> Dict[str, Any]:
@@ -1042,78 +1061,38 @@ class AIAgent:
                     """
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.ollama_base_url}/api/generate",
-                    json={
-                        "model": self.model,
-                        "prompt": prompt,
-                        "stream": False,
-                        "options": {
-                            "temperature": 0.3,  # Lower temperature for more focused analysis
-                            "top_p": 0.9
-                        }
-                    }
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    ai_response = result.get("response", "")
-                    
-                    # Enhanced cleaning and parsing of AI response
-                    clean_response = ai_response.strip()
-                    
-                    # Remove thinking tags for reasoning models
-                    if "<think>" in clean_response and "</think>" in clean_response:
-                        start = clean_response.find("</think>") + len("</think>")
-                        clean_response = clean_response[start:].strip()
-                    
-                    # Remove any leading/trailing markdown
-                    if clean_response.startswith("```json"):
-                        clean_response = clean_response[7:]
-                    elif clean_response.startswith("```"):
-                        clean_response = clean_response[3:]
-                    if clean_response.endswith("```"):
-                        clean_response = clean_response[:-3]
-                    clean_response = clean_response.strip()
-                    
-                    # Try to extract JSON from response if there's extra text
-                    json_start = clean_response.find("{")
-                    json_end = clean_response.rfind("}") + 1
-                    if json_start >= 0 and json_end > json_start:
-                        clean_response = clean_response[json_start:json_end]
-                    
-                    analysis_data = json.loads(clean_response)
-                    
-                    # Convert to our format
-                    proposed_changes = []
-                    for improvement in analysis_data.get("task_improvements", []):
-                        proposed_changes.append({
-                            "action": "update_task",
-                            "task_id": improvement.get("task_id"),
-                            "updates": {
-                                "description": improvement.get("improved_description", "")
-                            },
-                            "rationale": improvement.get("improvement_rationale", ""),
-                            "key_additions": improvement.get("key_additions", [])
-                        })
-                    
-                    return {
-                        "analysis": analysis_data,
-                        "proposed_changes": proposed_changes,
-                        "confidence_score": analysis_data.get("confidence_score", 0.75),
-                        "reasoning_steps": analysis_data.get("reasoning_steps", ["AI analysis completed"])
-                    }
-                else:
-                    print(f"AI service error: {response.status_code}")
-                    return self._fallback_description_analysis(gathered_data, task_ids)
-                    
+            ai_response = await self._generate(prompt, _ANALYSIS_OPTIONS)
+            
+            # Strip thinking tags, markdown and extra text around the JSON object
+            clean_response = extract_json_object(ai_response)
+            analysis_data = loads_json(clean_response)
+            
+            # Convert to our format
+            proposed_changes = []
+            for improvement in analysis_data.get("task_improvements", []):
+                proposed_changes.append({
+                    "action": "update_task",
+                    "task_id": improvement.get("task_id"),
+                    "updates": {
+                        "description": improvement.get("improved_description", "")
+                    },
+                    "rationale": improvement.get("improvement_rationale", ""),
+                    "key_additions": improvement.get("key_additions", [])
+                })
+            
+            return {
+                "analysis": analysis_data,
+                "proposed_changes": proposed_changes,
+                "confidence_score": analysis_data.get("confidence_score", 0.75),
+                "reasoning_steps": analysis_data.get("reasoning_steps", ["AI analysis completed"])
+            }
+
         except json.JSONDecodeError as e:
-            print(f"AI response parsing failed - Error: {str(e)}")
+            logger.warning("AI response parsing failed: %s", e)
             return self._fallback_description_analysis(gathered_data, task_ids)
             
         except Exception as e:
-            print(f"AI analysis failed - Error: {str(e)}")
+            logger.exception("AI analysis failed: %s", e)
             return self._fallback_description_analysis(gathered_data, task_ids)
 
     def _fallback_description_analysis(self, gathered_data: Dict, task_ids: List[int]) -> Dict[str, Any]:
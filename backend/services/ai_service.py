@@ -3,41 +3,48 @@ AI Service for generating project suggestions using Ollama
 """
 
 import os
+import asyncio
+import string
+import time
 import httpx
-import json
-from typing import List, Dict, Optional
+import logging
+from typing import AsyncIterator, List, Dict, Optional, Tuple
 from dotenv import load_dotenv
 from sqlalchemy.orm import Session
 
 from database import get_db
 from services.ai_tools import get_ai_tools
+from services.gen_cache import GenCache, template_id
+from services.llm_cache import LLMCache
+from services.ollama_utils import (
+    JSONArrayStream, dumps_json, extract_json_array, extract_response_text, loads_json, request_key
+)
 
 load_dotenv()
 
-class AIService:
-    def __init__(self):
-        self.base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-        self.model = os.getenv("AI_MODEL", "qwen3max:latest")
-        self.timeout = int(os.getenv("OLLAMA_TIMEOUT", "30"))
-        
-    async def generate_project_suggestions(self, project_title: str, project_description: str = None, 
-                                         project_location: str = None, next_action: str = None) -> List[Dict]:
-        """Generate AI-powered suggestions for a project"""
-        
-        # Create context for the AI
-        context = f"Project: {project_title}"
-        if project_description:
-            context += f"\nDescription: {project_description}"
-        if project_location:
-            context += f"\nLocation: {project_location}"
-        if next_action:
-            context += f"\nNext planned action: {next_action}"
-            
-        prompt = f"""You are helping someone manage their personal projects and stay motivated. 
+logger = logging.getLogger(__name__)
+
+# Ollama sampling options, shared across calls and never mutated
+_SUGGESTION_OPTIONS = {"temperature": 0.7, "top_p": 0.9}
+_SPLIT_OPTIONS = {"temperature": 0.6, "top_p": 0.9}  # Lower temperature for more focused, practical suggestions
+_QUICK_OPTIONS = {"temperature": 0.8}
+
+# How long successful generations stay in the response cache (seconds)
+_SUGGESTION_CACHE_TTL = 3600
+_SPLIT_CACHE_TTL = 24 * 3600
+_QUICK_CACHE_TTL = 300
+
+# How long a test_connection result is reused before asking Ollama again (seconds)
+_CONNECTION_CACHE_TTL = 30
+
+# Request bodies are pre-serialised with dumps_json rather than httpx's json=
+_JSON_HEADERS = {"content-type": "application/json"}
 
-{context}
+# Static prompt prefixes. Per-request inputs are appended after these so the
+# shared text forms a common prefix that providers and Ollama can cache.
+PROJECT_SUGGESTION_PREFIX = """You are helping someone manage their personal projects and stay motivated.
 
-Generate 3 practical suggestions for 15-minute tasks that would move this project forward. Each suggestion should be:
+Generate 3 practical suggestions for 15-minute tasks that would move the project given in the inputs below forward. Each suggestion should be:
 - Actionable and specific
 - Completable in 15 minutes or less
 - Motivating and positive
@@ -45,122 +52,23 @@ Generate 3 practical suggestions for 15-minute tasks that would move this projec
 
 Please respond with ONLY a JSON array in this exact format:
 [
-  {{
+  {
     "title": "Clear and specific task title",
     "description": "Detailed description of what to do",
     "estimated_minutes": 10,
     "energy_level": "low",
     "context": "when you're feeling overwhelmed",
     "reasoning": "Why this helps with motivation and progress"
-  }}
+  }
 ]
 
 Energy levels: "low" (tired, scattered), "medium" (normal), "high" (energetic, focused)
 Context examples: "when procrastinating", "when feeling overwhelmed", "when you have energy", "anytime"
 """
 
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/api/generate",
-                    json={
-                        "model": self.model,
-                        "prompt": prompt,
-                        "stream": False,
-                        "options": {
-                            "temperature": 0.7,
-                            "top_p": 0.9
-                        }
-                    }
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    ai_response = result.get("response", "")
-                    
-                    # Try to parse the JSON response
-                    try:
-                        # Clean up the response (remove any markdown formatting and thinking tags)
-                        clean_response = ai_response.strip()
-                        
-                        # Remove thinking tags for reasoning models
-                        if "<think>" in clean_response and "</think>" in clean_response:
-                            start = clean_response.find("</think>") + len("</think>")
-                            clean_response = clean_response[start:].strip()
-                        
-                        if clean_response.startswith("```json"):
-                            clean_response = clean_response[7:]
-                        if clean_response.endswith("```"):
-                            clean_response = clean_response[:-3]
-                        clean_response = clean_response.strip()
-                        
-                        suggestions = json.loads(clean_response)
-                        return suggestions if isinstance(suggestions, list) else []
-                        
-                    except json.JSONDecodeError:
-                        print(f"Failed to parse AI response: {ai_response}")
-                        return self._get_fallback_suggestions(project_title, project_location)
-                        
-                else:
-                    print(f"Ollama API error: {response.status_code}")
-                    return self._get_fallback_suggestions(project_title, project_location)
-                    
-        except Exception as e:
-            print(f"AI service error: {e}")
-            return self._get_fallback_suggestions(project_title, project_location)
+TASK_SPLIT_PREFIX = """You are a productivity expert helping someone break down a complex task into smaller, manageable pieces.
 
-    async def split_task_into_subtasks(self, task_id: int, db: Session = None) -> List[Dict]:
-        """
-        Split a complex task into smaller, manageable subtasks using AI
-        
-        Args:
-            task_id: The ID of the task to split
-            db: Database session (optional)
-            
-        Returns:
-            List of suggested subtasks as dictionaries
-        """
-        if db is None:
-            db = next(get_db())
-        
-        # Get AI tools for task operations
-        ai_tools = get_ai_tools(db)
-        
-        # Get task details using AI tools
-        task_details = ai_tools.get_task_details(task_id)
-        if not task_details:
-            raise ValueError(f"Task with ID {task_id} not found")
-        
-        # Get project context for better suggestions
-        project_context = ai_tools.get_project_context(task_details["project"]["id"])
-        existing_tasks = ai_tools.get_project_tasks(task_details["project"]["id"])
-        
-        # Create comprehensive context for the AI
-        context = f"""
-Task to split:
-- Title: {task_details['title']}
-- Description: {task_details['description']}
-- Priority: {task_details['priority']}
-- Estimated time: {task_details['estimated_minutes']} minutes
-- Energy level required: {task_details['energy_level']}
-- Context: {task_details['context']}
-
-Project context:
-- Project: {project_context['title'] if project_context else 'Unknown'}
-- Project description: {project_context['description'] if project_context else ''}
-- Location: {project_context['location'] if project_context else ''}
-- Next action planned: {project_context['next_action'] if project_context else ''}
-
-Existing tasks in project ({len(existing_tasks)} total):
-{chr(10).join([f"- {task['title']} ({task['status']})" for task in existing_tasks[:5]])}
-{"..." if len(existing_tasks) > 5 else ""}
-"""
-        
-        prompt = f"""You are a productivity expert helping someone break down a complex task into smaller, manageable pieces.
-
-{context}
-
-Please split this task into 3-5 smaller subtasks that are:
+Please split the task given in the inputs below into 3-5 smaller subtasks that are:
 1. Specific and actionable
 2. Can be completed in 5-20 minutes each
 3. Logically ordered (first things first)
@@ -171,78 +79,21 @@ Consider the original task's priority, energy level, and context when creating s
 
 Please respond with ONLY a JSON array in this exact format:
 [
-  {{
+  {
     "title": "Specific subtask title",
     "description": "Detailed description of what to do",
     "estimated_minutes": 15,
     "energy_level": "medium",
     "context": "when you have energy",
     "reasoning": "Why this subtask is important for completing the original task"
-  }}
+  }
 ]
 
 Energy levels: "low" (simple, low mental effort), "medium" (normal focus), "high" (deep focus, creative work)
 Context examples: "when feeling focused", "when you have energy", "anytime", "when procrastinating"
 """
 
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/api/generate",
-                    json={
-                        "model": self.model,
-                        "prompt": prompt,
-                        "stream": False,
-                        "options": {
-                            "temperature": 0.6,  # Lower temperature for more focused, practical suggestions
-                            "top_p": 0.9
-                        }
-                    }
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    ai_response = result.get("response", "")
-                    
-                    try:
-                        # Clean up the response (remove thinking tags for reasoning models)
-                        clean_response = ai_response.strip()
-                        
-                        # Remove thinking tags for reasoning models like qwen3max
-                        if "<think>" in clean_response and "</think>" in clean_response:
-                            start = clean_response.find("</think>") + len("</think>")
-                            clean_response = clean_response[start:].strip()
-                        
-                        if clean_response.startswith("```json"):
-                            clean_response = clean_response[7:]
-                        if clean_response.endswith("```"):
-                            clean_response = clean_response[:-3]
-                        clean_response = clean_response.strip()
-                        
-                        subtasks = json.loads(clean_response)
-                        
-                        # Validate and return subtasks
-                        if isinstance(subtasks, list) and len(subtasks) > 0:
-                            return subtasks
-                        else:
-                            return self._get_fallback_split_tasks(task_details)
-                            
-                    except json.JSONDecodeError:
-                        print(f"Failed to parse task split response: {ai_response}")
-                        return self._get_fallback_split_tasks(task_details)
-                        
-                else:
-                    print(f"Ollama API error during task split: {response.status_code}")
-                    return self._get_fallback_split_tasks(task_details)
-                    
-        except Exception as e:
-            print(f"AI service error during task split: {e}")
-            return self._get_fallback_split_tasks(task_details)
-    
-    async def generate_quick_suggestions(self) -> List[Dict]:
-        """Generate quick general suggestions when user is idle"""
-        
-        prompt = """Generate 2 quick suggestions for someone who is idle and needs motivation to work on their projects. 
+QUICK_SUGGESTION_PREFIX = """Generate 2 quick suggestions for someone who is idle and needs motivation to work on their projects. 
 
 Please respond with ONLY a JSON array in this exact format:
 [
@@ -259,51 +110,311 @@ Please respond with ONLY a JSON array in this exact format:
 Focus on simple, universal tasks that help with motivation and getting unstuck.
 """
 
+# Full prompt templates: the static prefix followed by the per-request inputs
+_INPUTS_HEADER = "\n---\nInputs:\n"
+_PROJECT_SUGGESTION_TMPL = string.Template(PROJECT_SUGGESTION_PREFIX + _INPUTS_HEADER + "$context")
+_TASK_SPLIT_TMPL = string.Template(TASK_SPLIT_PREFIX + _INPUTS_HEADER + """Task to split:
+- Title: $title
+- Description: $description
+- Priority: $priority
+- Estimated time: $estimated_minutes minutes
+- Energy level required: $energy_level
+- Context: $context
+
+Project context:
+- Project: $project_title
+- Project description: $project_description
+- Location: $project_location
+- Next action planned: $project_next_action
+
+Existing tasks in project ($task_count total):
+$task_list
+$more_tasks""")
+
+# Project context used in the split prompt when the task has no project
+_UNKNOWN_PROJECT = {"title": "Unknown", "description": "", "location": "", "next_action": ""}
+
+# Labels for the project slots shown to the model
+_PROJECT_SLOT_LABELS = {
+    "title": "Project",
+    "description": "Description",
+    "location": "Location",
+    "next_action": "Next planned action",
+}
+
+
+def _project_slots(project_title: str, project_description: str = None,
+                   project_location: str = None, next_action: str = None) -> Dict[str, str]:
+    """Variable parts of the project prompt, in the order they appear in the context"""
+    slots = {"title": project_title}
+    if project_description:
+        slots["description"] = project_description
+    if project_location:
+        slots["location"] = project_location
+    if next_action:
+        slots["next_action"] = next_action
+    return slots
+
+
+def _build_project_prompt(slots: Dict[str, str]) -> str:
+    """Build the project suggestion prompt from its slot values"""
+    # Create context for the AI
+    context = "\n".join(f"{_PROJECT_SLOT_LABELS[name]}: {value}" for name, value in slots.items())
+    return _PROJECT_SUGGESTION_TMPL.substitute(context=context)
+
+class AIService:
+    def __init__(self):
+        self.base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+        self.model = os.getenv("AI_MODEL", "qwen3max:latest")
+        self.timeout = int(os.getenv("OLLAMA_TIMEOUT", "30"))
+        # Requests Ollama serves at once; extra generations queue here instead
+        self.num_parallel = int(os.getenv("OLLAMA_NUM_PARALLEL", "4"))
+        
+        # Shared connection pool to Ollama, created on first use
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._generate_slots: Optional[asyncio.Semaphore] = None
+        
+        # Parsed results of successful generations, keyed by request_key()
+        self.cache = LLMCache(max_entries=int(os.getenv("LLM_CACHE_SIZE", "256")))
+        
+        # Project suggestions reusable across projects with near-identical inputs
+        self.gen_cache = GenCache()
+        
+        # Last test_connection result as (time.monotonic() when checked, result)
+        self._connection_status: Optional[Tuple[float, bool]] = None
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the pooled Ollama client, creating it for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            # Pooled connections are bound to the loop that opened them
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=30)
+            )
+            self._client_loop = loop
+            self._generate_slots = asyncio.Semaphore(self.num_parallel)
+        return self._client
+    
+    async def aclose(self) -> None:
+        """Close the pooled Ollama client"""
+        client, loop = self._client, self._client_loop
+        self._client = None
+        self._client_loop = None
+        # A client from another (finished) loop can't be closed from here
+        if client is not None and loop is asyncio.get_running_loop():
+            await client.aclose()
+        
+    async def _post_generate(self, prompt: str, options: Dict) -> str:
+        """Send a generate request to Ollama and return the response text
+        
+        Raises httpx.HTTPError if Ollama can't be reached or answers with an error status.
+        """
+        client = self._get_client()
+        async with self._generate_slots:
+            response = await client.post(
+                "/api/generate",
+                content=dumps_json({
+                    "model": self.model,
+                    "prompt": prompt,
+                    "stream": False,
+                    "options": options
+                }),
+                headers=_JSON_HEADERS
+            )
+        response.raise_for_status()
+        return extract_response_text(response.content)
+    
+    async def generate_project_suggestions(self, project_title: str, project_description: str = None, 
+                                         project_location: str = None, next_action: str = None) -> List[Dict]:
+        """Generate AI-powered suggestions for a project"""
+        
+        slots = _project_slots(project_title, project_description, project_location, next_action)
+        prompt = _build_project_prompt(slots)
+        skeleton_id = template_id(_build_project_prompt({name: f"{{{name}}}" for name in slots}))
+
+        try:
+            cache_key = request_key(self.model, prompt, _SUGGESTION_OPTIONS)
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+            
+            # Reuse a response generated for a structurally identical, similar project
+            similar = self.gen_cache.lookup(skeleton_id, slots)
+            if similar is not None:
+                return similar
+            
+            ai_response = await self._post_generate(prompt, _SUGGESTION_OPTIONS)
+            suggestions = extract_json_array(ai_response)
+        except Exception:
+            logger.warning("Project suggestion generation failed, using fallback", exc_info=True)
+            return self._get_fallback_suggestions(project_title, project_location)
+        
+        await self.cache.set(cache_key, suggestions, ttl=_SUGGESTION_CACHE_TTL)
+        self.gen_cache.store(skeleton_id, slots, suggestions)
+        return suggestions
+
+    async def stream_project_suggestions(self, project_title: str, project_description: str = None,
+                                         project_location: str = None, next_action: str = None) -> AsyncIterator[Dict]:
+        """
+        Stream AI-powered suggestions for a project as the model produces them
+        
+        Each suggestion is yielded as soon as its JSON object is complete rather
+        than after the whole generation finishes. Falls back to the static
+        suggestions if the model is unavailable or produces nothing usable.
+        """
+        slots = _project_slots(project_title, project_description, project_location, next_action)
+        prompt = _build_project_prompt(slots)
+        cache_key = request_key(self.model, prompt, _SUGGESTION_OPTIONS)
+        
+        cached = await self.cache.get(cache_key)
+        if cached is not None:
+            for suggestion in cached:
+                yield suggestion
+            return
+        
+        suggestions = []
+        parser = JSONArrayStream()
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/api/generate",
-                    json={
+            client = self._get_client()
+            # The stream holds a generation slot until it finishes, like _post_generate
+            async with self._generate_slots:
+                async with client.stream(
+                    "POST",
+                    "/api/generate",
+                    content=dumps_json({
                         "model": self.model,
                         "prompt": prompt,
-                        "stream": False,
-                        "options": {
-                            "temperature": 0.8,
-                        }
-                    }
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    ai_response = result.get("response", "")
-                    
-                    try:
-                        # Clean up the response (remove thinking tags for reasoning models)
-                        clean_response = ai_response.strip()
-                        
-                        # Remove thinking tags for reasoning models like qwen3max
-                        if "<think>" in clean_response and "</think>" in clean_response:
-                            start = clean_response.find("</think>") + len("</think>")
-                            clean_response = clean_response[start:].strip()
-                        
-                        if clean_response.startswith("```json"):
-                            clean_response = clean_response[7:]
-                        if clean_response.endswith("```"):
-                            clean_response = clean_response[:-3]
-                        clean_response = clean_response.strip()
-                        
-                        suggestions = json.loads(clean_response)
-                        return suggestions if isinstance(suggestions, list) else []
-                        
-                    except json.JSONDecodeError:
-                        return self._get_fallback_quick_suggestions()
-                        
-                else:
-                    return self._get_fallback_quick_suggestions()
-                    
-        except Exception as e:
-            print(f"AI service error: {e}")
+                        "stream": True,
+                        "options": _SUGGESTION_OPTIONS
+                    }),
+                    headers=_JSON_HEADERS
+                ) as response:
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        if not line:
+                            continue
+                        chunk = loads_json(line)
+                        for suggestion in parser.feed(chunk.get("response", "")):
+                            suggestions.append(suggestion)
+                            yield suggestion
+                        if parser.done or chunk.get("done"):
+                            break
+        except Exception:
+            logger.warning("Streaming project suggestions failed", exc_info=True)
+        
+        if parser.done and suggestions:
+            await self.cache.set(cache_key, suggestions, ttl=_SUGGESTION_CACHE_TTL)
+        elif not suggestions:
+            for suggestion in self._get_fallback_suggestions(project_title, project_location):
+                yield suggestion
+
+    async def generate_project_suggestions_bulk(self, projects: List[Dict]) -> List[List[Dict]]:
+        """
+        Generate suggestions for several projects concurrently
+        
+        At most num_parallel generations are sent to Ollama at a time (see
+        OLLAMA_NUM_PARALLEL); the rest wait for a free slot.
+        
+        Args:
+            projects: Dicts with "title" and optional "description", "location"
+                and "next_action" keys
+            
+        Returns:
+            One suggestion list per project, in the same order
+        """
+        return await asyncio.gather(*(
+            self.generate_project_suggestions(
+                project["title"],
+                project.get("description"),
+                project.get("location"),
+                project.get("next_action")
+            )
+            for project in projects
+        ))
+
+    async def split_task_into_subtasks(self, task_id: int, db: Session = None) -> List[Dict]:
+        """
+        Split a complex task into smaller, manageable subtasks using AI
+        
+        Args:
+            task_id: The ID of the task to split
+            db: Database session (optional)
+            
+        Returns:
+            List of suggested subtasks as dictionaries
+        """
+        if db is None:
+            db = next(get_db())
+        
+        # Get AI tools for task operations
+        ai_tools = get_ai_tools(db)
+        
+        # Get task details, project context and sibling tasks in one pass
+        split_context = ai_tools.get_split_context(task_id)
+        if not split_context:
+            raise ValueError(f"Task with ID {task_id} not found")
+        
+        task_details = split_context["task"]
+        project_context = split_context["project"]
+        existing_tasks = split_context["project_tasks"]
+        
+        # Fill in the comprehensive context for the AI
+        project_context = project_context or _UNKNOWN_PROJECT
+        prompt = _TASK_SPLIT_TMPL.substitute(
+            title=task_details['title'],
+            description=task_details['description'],
+            priority=task_details['priority'],
+            estimated_minutes=task_details['estimated_minutes'],
+            energy_level=task_details['energy_level'],
+            context=task_details['context'],
+            project_title=project_context['title'],
+            project_description=project_context['description'],
+            project_location=project_context['location'],
+            project_next_action=project_context['next_action'],
+            task_count=len(existing_tasks),
+            task_list="\n".join(f"- {task['title']} ({task['status']})" for task in existing_tasks[:5]),
+            more_tasks="..." if len(existing_tasks) > 5 else ""
+        ).rstrip()
+
+        try:
+            cache_key = request_key(self.model, prompt, _SPLIT_OPTIONS)
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+            
+            ai_response = await self._post_generate(prompt, _SPLIT_OPTIONS)
+            subtasks = extract_json_array(ai_response)
+        except Exception:
+            logger.warning("Task split generation failed, using fallback", exc_info=True)
+            return self._get_fallback_split_tasks(task_details)
+        
+        if not subtasks:
+            return self._get_fallback_split_tasks(task_details)
+        await self.cache.set(cache_key, subtasks, ttl=_SPLIT_CACHE_TTL)
+        return subtasks
+    
+    async def generate_quick_suggestions(self) -> List[Dict]:
+        """Generate quick general suggestions when user is idle"""
+        
+        prompt = QUICK_SUGGESTION_PREFIX
+
+        try:
+            cache_key = request_key(self.model, prompt, _QUICK_OPTIONS)
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+            
+            ai_response = await self._post_generate(prompt, _QUICK_OPTIONS)
+            suggestions = extract_json_array(ai_response)
+        except Exception:
+            logger.warning("Quick suggestion generation failed, using fallback", exc_info=True)
             return self._get_fallback_quick_suggestions()
+        
+        await self.cache.set(cache_key, suggestions, ttl=_QUICK_CACHE_TTL)
+        return suggestions
     
     def _get_fallback_suggestions(self, project_title: str, location: str = None) -> List[Dict]:
         """Fallback suggestions when AI is unavailable"""
@@ -391,17 +502,40 @@ Focus on simple, universal tasks that help with motivation and getting unstuck.
     
     async def test_connection(self) -> bool:
         """Test if Ollama is running and the model is available"""
+        now = time.monotonic()
+        if self._connection_status is not None:
+            checked_at, available = self._connection_status
+            if now - checked_at < _CONNECTION_CACHE_TTL:
+                return available
+        
+        available = await self._check_connection()
+        self._connection_status = (now, available)
+        return available
+    
+    async def _check_connection(self) -> bool:
+        """Ask Ollama whether it is running and has our model"""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                # Check if Ollama is running
-                response = await client.get(f"{self.base_url}/api/tags")
-                if response.status_code != 200:
-                    return False
-                
-                # Check if our model is available
-                models = response.json().get("models", [])
-                model_names = [model.get("name", "") for model in models]
-                return self.model in model_names
-                
+            client = self._get_client()
+            # Check if Ollama is running
+            response = await client.get("/api/tags")
+            if response.status_code != 200:
+                return False
+            
+            # Check if our model is available
+            models = response.json().get("models", [])
+            model_names = {model.get("name", "") for model in models}
+            return self.model in model_names
+            
         except Exception:
-            return False 
\ No newline at end of file
+            return False
+
+
+# Global service instance
+_service_instance = None
+
+def get_ai_service() -> AIService:
+    """Get the global AI service instance"""
+    global _service_instance
+    if _service_instance is None:
+        _service_instance = AIService()
+    return _service_instance
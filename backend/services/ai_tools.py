@@ -6,9 +6,9 @@ These functions are designed to be used by the AI service for task splitting
 and other AI-assisted operations.
 """
 
-from typing import List, Dict, Optional, Any
-from sqlalchemy.orm import Session
-from datetime import datetime
+from typing import List, Dict, Mapping, Optional, Any
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.orm import Session, joinedload
 
 from database import get_db
 from models.task import Task
@@ -31,34 +31,17 @@ class AITaskTools:
         Returns:
             Dictionary with task details or None if not found
         """
-        task = self.db.query(Task).filter(Task.id == task_id).first()
+        # Load the project for context in the same query
+        task = (
+            self.db.query(Task)
+            .options(joinedload(Task.project))
+            .filter(Task.id == task_id)
+            .first()
+        )
         if not task:
             return None
-            
-        # Get project info for context
-        project = self.db.query(Project).filter(Project.id == task.project_id).first()
         
-        return {
-            "id": task.id,
-            "title": task.title,
-            "description": task.description or "",
-            "status": task.status,
-            "priority": task.priority,
-            "estimated_minutes": task.estimated_minutes,
-            "actual_minutes": task.actual_minutes,
-            "energy_level": task.energy_level,
-            "context": task.context or "",
-            "is_completed": task.is_completed,
-            "is_suggestion": task.is_suggestion,
-            "created_at": task.created_at.isoformat() if task.created_at else None,
-            "project": {
-                "id": project.id if project else None,
-                "title": project.title if project else "Unknown Project",
-                "description": project.description if project else "",
-                "location": project.location if project else "",
-                "next_action": project.next_action if project else ""
-            }
-        }
+        return _task_details(task, task.project)
     
     def get_project_tasks(self, project_id: int) -> List[Dict[str, Any]]:
         """
@@ -70,24 +53,10 @@ class AITaskTools:
         Returns:
             List of task dictionaries
         """
-        tasks = self.db.query(Task).filter(Task.project_id == project_id).all()
+        stmt = select(*_TASK_SUMMARY_COLUMNS).where(Task.project_id == project_id)
+        rows = self.db.execute(stmt).mappings().all()
         
-        task_list = []
-        for task in tasks:
-            task_list.append({
-                "id": task.id,
-                "title": task.title,
-                "description": task.description or "",
-                "status": task.status,
-                "priority": task.priority,
-                "estimated_minutes": task.estimated_minutes,
-                "energy_level": task.energy_level,
-                "context": task.context or "",
-                "is_completed": task.is_completed,
-                "is_suggestion": task.is_suggestion
-            })
-        
-        return task_list
+        return [_task_summary(row) for row in rows]
     
     def create_task(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -100,17 +69,7 @@ class AITaskTools:
             Dictionary with created task details
         """
         # Create new task with provided data
-        new_task = Task(
-            project_id=task_data.get("project_id"),
-            title=task_data.get("title", "Untitled Task"),
-            description=task_data.get("description", ""),
-            status=task_data.get("status", "pending"),
-            priority=task_data.get("priority", "medium"),
-            estimated_minutes=task_data.get("estimated_minutes", 15),
-            energy_level=task_data.get("energy_level", "medium"),
-            context=task_data.get("context", ""),
-            is_suggestion=task_data.get("is_suggestion", False)
-        )
+        new_task = Task(**_new_task_values(task_data))
         
         self.db.add(new_task)
         self.db.commit()
@@ -139,44 +98,28 @@ class AITaskTools:
         Returns:
             List of created task dictionaries
         """
-        created_tasks = []
+        if not tasks_data:
+            return []
         
-        for task_data in tasks_data:
-            new_task = Task(
-                project_id=task_data.get("project_id"),
-                title=task_data.get("title", "Untitled Task"),
-                description=task_data.get("description", ""),
-                status=task_data.get("status", "pending"),
-                priority=task_data.get("priority", "medium"),
-                estimated_minutes=task_data.get("estimated_minutes", 15),
-                energy_level=task_data.get("energy_level", "medium"),
-                context=task_data.get("context", ""),
-                is_suggestion=task_data.get("is_suggestion", False)
-            )
-            
-            self.db.add(new_task)
-            created_tasks.append(new_task)
+        rows = [_new_task_values(task_data) for task_data in tasks_data]
+        dialect = self.db.get_bind().dialect
         
-        self.db.commit()
-        
-        # Refresh all tasks and return data
-        result_tasks = []
-        for task in created_tasks:
-            self.db.refresh(task)
-            result_tasks.append({
-                "id": task.id,
-                "title": task.title,
-                "description": task.description,
-                "status": task.status,
-                "priority": task.priority,
-                "estimated_minutes": task.estimated_minutes,
-                "energy_level": task.energy_level,
-                "context": task.context,
-                "is_suggestion": task.is_suggestion,
-                "created_at": task.created_at.isoformat() if task.created_at else None
-            })
+        if dialect.insert_executemany_returning:
+            # One INSERT ... RETURNING for every row instead of a refresh per task.
+            # Ids are assigned in VALUES order, so sorting on them restores input order.
+            stmt = insert(Task).returning(*_CREATED_TASK_COLUMNS)
+            created = sorted(self.db.execute(stmt, rows).mappings().all(), key=lambda row: row["id"])
+            self.db.commit()
+        else:
+            tasks = [Task(**values) for values in rows]
+            self.db.add_all(tasks)
+            self.db.commit()
+            for task in tasks:
+                self.db.refresh(task)
+            created = [{column.key: getattr(task, column.key) for column in _CREATED_TASK_COLUMNS}
+                       for task in tasks]
         
-        return result_tasks
+        return [_created_task(row) for row in created]
     
     def update_task(self, task_id: int, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
@@ -189,40 +132,26 @@ class AITaskTools:
         Returns:
             Dictionary with updated task details or None if not found
         """
-        task = self.db.query(Task).filter(Task.id == task_id).first()
-        if not task:
-            return None
-        
-        # Apply updates
-        for field, value in updates.items():
-            if hasattr(task, field):
-                setattr(task, field, value)
-        
-        # Handle completion logic
-        if "is_completed" in updates:
-            if updates["is_completed"] and not task.is_completed:
-                task.completed_at = datetime.utcnow()
-                task.status = "completed"
-            elif not updates["is_completed"] and task.is_completed:
-                task.completed_at = None
-                if task.status == "completed":
-                    task.status = "pending"
+        values = {field: value for field, value in updates.items() if field in _TASK_COLUMN_NAMES}
+        if not values:
+            row = self.db.execute(
+                select(*_UPDATED_TASK_COLUMNS).where(Task.id == task_id)
+            ).mappings().first()
+            return dict(row) if row else None
         
+        # Update and read back the task in one statement where supported
+        stmt = update(Task).where(Task.id == task_id).values(**values)
+        if self.db.get_bind().dialect.update_returning:
+            row = self.db.execute(stmt.returning(*_UPDATED_TASK_COLUMNS)).mappings().first()
+        elif self.db.execute(stmt).rowcount:
+            row = self.db.execute(
+                select(*_UPDATED_TASK_COLUMNS).where(Task.id == task_id)
+            ).mappings().first()
+        else:
+            row = None
         self.db.commit()
-        self.db.refresh(task)
         
-        return {
-            "id": task.id,
-            "title": task.title,
-            "description": task.description,
-            "status": task.status,
-            "priority": task.priority,
-            "estimated_minutes": task.estimated_minutes,
-            "energy_level": task.energy_level,
-            "context": task.context,
-            "is_completed": task.is_completed,
-            "is_suggestion": task.is_suggestion
-        }
+        return dict(row) if row else None
     
     def delete_task(self, task_id: int) -> bool:
         """
@@ -234,13 +163,9 @@ class AITaskTools:
         Returns:
             True if deleted successfully, False if not found
         """
-        task = self.db.query(Task).filter(Task.id == task_id).first()
-        if not task:
-            return False
-        
-        self.db.delete(task)
+        deleted = self.db.execute(delete(Task).where(Task.id == task_id)).rowcount
         self.db.commit()
-        return True
+        return deleted > 0
     
     def get_project_context(self, project_id: int) -> Optional[Dict[str, Any]]:
         """
@@ -256,26 +181,47 @@ class AITaskTools:
         if not project:
             return None
         
-        # Get task statistics
-        tasks = self.db.query(Task).filter(Task.project_id == project_id).all()
-        total_tasks = len(tasks)
-        completed_tasks = len([t for t in tasks if t.is_completed])
-        pending_tasks = total_tasks - completed_tasks
+        # Get task statistics without loading the task rows
+        total_tasks, completed_tasks = self.db.query(
+            func.count(Task.id),
+            func.sum(case((Task.is_completed, 1), else_=0))
+        ).filter(Task.project_id == project_id).one()
+        
+        return _project_context(project, total_tasks, completed_tasks or 0)
+    
+    def get_split_context(self, task_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get everything needed to split a task in two queries
+        
+        Loads the task together with its project, then the project's tasks
+        once, and derives the task details, project context and task list
+        from those rows.
+        
+        Args:
+            task_id: The ID of the task to split
+            
+        Returns:
+            Dictionary with "task", "project" and "project_tasks" entries
+            (shaped like get_task_details, get_project_context and
+            get_project_tasks) or None if the task doesn't exist
+        """
+        task = (
+            self.db.query(Task)
+            .options(joinedload(Task.project))
+            .filter(Task.id == task_id)
+            .first()
+        )
+        if not task:
+            return None
+        
+        project = task.project
+        project_tasks = self.get_project_tasks(task.project_id)
+        completed_tasks = sum(1 for t in project_tasks if t["is_completed"])
         
         return {
-            "id": project.id,
-            "title": project.title,
-            "description": project.description or "",
-            "location": project.location or "",
-            "next_action": project.next_action or "",
-            "priority": project.priority,
-            "estimated_time": project.estimated_time,
-            "tags": project.tags or "",
-            "task_stats": {
-                "total": total_tasks,
-                "completed": completed_tasks,
-                "pending": pending_tasks
-            }
+            "task": _task_details(task, project),
+            "project": _project_context(project, len(project_tasks), completed_tasks) if project else None,
+            "project_tasks": project_tasks
         }
 
 
@@ -292,4 +238,111 @@ def get_ai_tools(db: Session = None) -> AITaskTools:
     if db is None:
         db = next(get_db())
     
-    return AITaskTools(db) 
\ No newline at end of file
+    return AITaskTools(db)
+
+
+def _task_details(task: Task, project: Optional[Project]) -> Dict[str, Any]:
+    """Full task details with a summary of its project"""
+    return {
+        "id": task.id,
+        "title": task.title,
+        "description": task.description or "",
+        "status": task.status,
+        "priority": task.priority,
+        "estimated_minutes": task.estimated_minutes,
+        "actual_minutes": task.actual_minutes,
+        "energy_level": task.energy_level,
+        "context": task.context or "",
+        "is_completed": task.is_completed,
+        "is_suggestion": task.is_suggestion,
+        "created_at": task.created_at.isoformat() if task.created_at else None,
+        "project": {
+            "id": project.id if project else None,
+            "title": project.title if project else "Unknown Project",
+            "description": project.description if project else "",
+            "location": project.location if project else "",
+            "next_action": project.next_action if project else ""
+        }
+    }
+
+
+# Task columns listed when describing a project's tasks
+_TASK_SUMMARY_COLUMNS = (
+    Task.id,
+    Task.title,
+    Task.description,
+    Task.status,
+    Task.priority,
+    Task.estimated_minutes,
+    Task.energy_level,
+    Task.context,
+    Task.is_completed,
+    Task.is_suggestion,
+)
+
+
+def _task_summary(row: Mapping[str, Any]) -> Dict[str, Any]:
+    """Task summary dict from a row selected with _TASK_SUMMARY_COLUMNS"""
+    return {**row, "description": row["description"] or "", "context": row["context"] or ""}
+
+
+def _project_context(project: Project, total_tasks: int, completed_tasks: int) -> Dict[str, Any]:
+    """Project details plus task statistics for AI analysis"""
+    return {
+        "id": project.id,
+        "title": project.title,
+        "description": project.description or "",
+        "location": project.location or "",
+        "next_action": project.next_action or "",
+        "priority": project.priority,
+        "estimated_time": project.estimated_time,
+        "tags": project.tags or "",
+        "task_stats": {
+            "total": total_tasks,
+            "completed": completed_tasks,
+            "pending": total_tasks - completed_tasks
+        }
+    }
+
+
+def _new_task_values(task_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Column values for a new task, with defaults for anything not provided"""
+    return {
+        "project_id": task_data.get("project_id"),
+        "title": task_data.get("title", "Untitled Task"),
+        "description": task_data.get("description", ""),
+        "status": task_data.get("status", "pending"),
+        "priority": task_data.get("priority", "medium"),
+        "estimated_minutes": task_data.get("estimated_minutes", 15),
+        "energy_level": task_data.get("energy_level", "medium"),
+        "context": task_data.get("context", ""),
+        "is_suggestion": task_data.get("is_suggestion", False)
+    }
+
+
+# Task columns returned for newly created tasks
+_CREATED_TASK_COLUMNS = (
+    Task.id,
+    Task.title,
+    Task.description,
+    Task.status,
+    Task.priority,
+    Task.estimated_minutes,
+    Task.energy_level,
+    Task.context,
+    Task.is_suggestion,
+    Task.created_at,
+)
+
+
+def _created_task(row: Mapping[str, Any]) -> Dict[str, Any]:
+    """Created task dict from a row with _CREATED_TASK_COLUMNS"""
+    created_at = row["created_at"]
+    return {**row, "created_at": created_at.isoformat() if created_at else None}
+
+
+# Task fields that update_task will write
+_TASK_COLUMN_NAMES = frozenset(Task.__table__.columns.keys())
+
+# Task columns returned after an update
+_UPDATED_TASK_COLUMNS = _TASK_SUMMARY_COLUMNS
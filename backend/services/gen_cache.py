@@ -0,0 +1,75 @@
+"""
+Structural cache for templated LLM prompts
+
+Prompts built from the same skeleton differ only in their slot values (for
+project suggestions: title, description, location and next action). When a
+new request matches a cached skeleton and its slot texts are close enough to
+a cached request's, the cached response is reused with the old slot values
+rewritten to the new ones instead of running another generation.
+"""
+
+import hashlib
+from collections import OrderedDict
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def template_id(skeleton: str) -> str:
+    """Identify a prompt skeleton (the prompt with slot values as placeholders)"""
+    return hashlib.sha256(skeleton.encode("utf-8")).hexdigest()
+
+
+class GenCache:
+    """Reuse responses across prompts that share a skeleton and similar slots"""
+
+    def __init__(self, max_entries: int = 128, min_similarity: float = 0.85):
+        self.max_entries = max_entries
+        self.min_similarity = min_similarity
+        self._entries: "OrderedDict[Tuple[str, Tuple[Tuple[str, str], ...]], List[Dict[str, Any]]]" = OrderedDict()
+
+    def lookup(self, skeleton_id: str, slots: Dict[str, str]) -> Optional[List[Dict[str, Any]]]:
+        """Return a response synthesised from the closest cached match, if any"""
+        slot_text = _slot_text(slots)
+        best_score, best = 0.0, None
+        for (cached_id, cached_slots), response in self._entries.items():
+            if cached_id != skeleton_id or len(cached_slots) != len(slots):
+                continue
+            cached = dict(cached_slots)
+            if cached.keys() != slots.keys():
+                continue
+            score = SequenceMatcher(None, _slot_text(cached), slot_text).ratio()
+            if score > best_score:
+                best_score, best = score, (cached, response)
+
+        if best is None or best_score < self.min_similarity:
+            return None
+        cached, response = best
+        replacements = [(cached[name], slots[name]) for name in slots
+                        if cached[name] and cached[name] != slots[name]]
+        return [_rewrite(item, replacements) for item in response]
+
+    def store(self, skeleton_id: str, slots: Dict[str, str], response: List[Dict[str, Any]]) -> None:
+        """Remember a generated response for this skeleton and slot values"""
+        key = (skeleton_id, tuple(sorted(slots.items())))
+        self._entries[key] = response
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _slot_text(slots: Dict[str, str]) -> str:
+    return "\n".join(slots[name] for name in sorted(slots))
+
+
+def _rewrite(item: Dict[str, Any], replacements: List[Tuple[str, str]]) -> Dict[str, Any]:
+    """Copy a response item, substituting old slot values in its string fields"""
+    rewritten = {}
+    for field, value in item.items():
+        if isinstance(value, str):
+            for old, new in replacements:
+                value = value.replace(old, new)
+        rewritten[field] = value
+    return rewritten
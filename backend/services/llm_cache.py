@@ -0,0 +1,49 @@
+"""
+In-memory response cache for LLM calls
+
+Maps a request key (see services.ollama_utils.request_key) to the parsed
+result of a successful generation, with LRU eviction and per-entry TTL.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class LLMCache:
+    """LRU + TTL cache for parsed LLM responses"""
+
+    def __init__(self, max_entries: int = 256, default_ttl: float = 3600):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0}
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return value
+            del self._entries[key]
+        self.stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store value under key, evicting the least recently used entries"""
+        expires_at = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries and reset the hit/miss counters"""
+        self._entries.clear()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,156 @@
+"""
+Helpers for working with raw Ollama API responses
+"""
+
+import hashlib
+import json
+import re
+from typing import Any, List, Optional
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Matches the key of the generated text field in a /api/generate body
+_RESPONSE_FIELD = re.compile(r'"response"\s*:\s*(?=")')
+# Skips an optional <think> block and lands just before the first "["
+_ARRAY_START = re.compile(r"(?:.*</think>)?(?P<body>[^\[]*)(?=\[)", re.DOTALL)
+_decoder = json.JSONDecoder()
+
+
+def dumps_json(payload: Any) -> bytes:
+    """Serialise a JSON body to bytes, using orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads_json(data: Any) -> Any:
+    """Parse JSON from str or bytes, using orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def extract_response_text(content: bytes) -> str:
+    """Return the ``response`` field of a non-streaming /api/generate body.
+
+    Only the string value is decoded; the rest of the wrapper (including the
+    potentially large ``context`` token array) is never parsed.
+    """
+    text = content.decode("utf-8") if isinstance(content, (bytes, bytearray)) else content
+    match = _RESPONSE_FIELD.search(text)
+    if match is None:
+        return loads_json(text).get("response", "")
+    value, _ = _decoder.raw_decode(text, match.end())
+    return value
+
+
+def request_key(model: str, prompt: str, options: dict) -> str:
+    """Stable key identifying a generate request by model, prompt and options"""
+    payload = json.dumps({"model": model, "prompt": prompt, "options": options}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def extract_json_object(text: str) -> str:
+    """Slice the outermost JSON object out of a model reply.
+
+    Drops any ``<think>`` preamble from reasoning models, then takes everything
+    from the first ``{`` to the last ``}``, which also discards markdown fences
+    and chatter around the object. Returns the stripped text unchanged when no
+    object is found so the caller's JSON decode reports the error.
+    """
+    start = text.rfind("</think>")
+    start = 0 if start < 0 else start + len("</think>")
+    json_start = text.find("{", start)
+    json_end = text.rfind("}") + 1
+    if json_start >= 0 and json_end > json_start:
+        return text[json_start:json_end]
+    return text[start:].strip()
+
+
+def extract_json_array(text: str) -> List[Any]:
+    """Decode the first JSON array in a model reply.
+
+    Skips any ``<think>`` preamble, then decodes from the first ``[``. The
+    span up to the last ``]`` is tried first (the common case, and the one
+    orjson can parse); otherwise ``raw_decode`` stops at the end of the array
+    so markdown fences or chatter on either side are ignored. Raises
+    ``json.JSONDecodeError`` when no array can be decoded.
+    """
+    match = _ARRAY_START.match(text)
+    if match is None:
+        raise json.JSONDecodeError("No JSON array found", text, 0)
+    start = match.end("body")
+    try:
+        value = loads_json(text[start:text.rfind("]") + 1])
+    except ValueError:
+        value, _ = _decoder.raw_decode(text, start)
+    if not isinstance(value, list):
+        raise json.JSONDecodeError("Expected a JSON array", text, start)
+    return value
+
+
+class JSONArrayStream:
+    """Incrementally parse the elements of a JSON array from streamed model text.
+
+    Text is fed in as it arrives; each call to ``feed`` returns the array
+    elements completed by that chunk. A leading ``<think>`` block and any text
+    before the opening ``[`` (such as a markdown fence) are skipped.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._body_start: Optional[int] = None
+        self._pos: Optional[int] = None
+        self.done = False
+
+    def feed(self, chunk: str) -> List[Any]:
+        """Add streamed text and return any array elements it completed"""
+        self._buffer += chunk
+        items: List[Any] = []
+        if self.done or not self._find_array_start():
+            return items
+
+        buffer = self._buffer
+        pos = self._pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(buffer):
+                break
+            if buffer[pos] == "]":
+                self.done = True
+                break
+            try:
+                item, pos = _decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Element not complete yet, wait for more text
+                break
+            items.append(item)
+        self._pos = pos
+        return items
+
+    def _find_array_start(self) -> bool:
+        if self._pos is not None:
+            return True
+        if self._body_start is None:
+            stripped = self._buffer.lstrip()
+            offset = len(self._buffer) - len(stripped)
+            if stripped.startswith("<think>"):
+                end = self._buffer.find("</think>", offset)
+                if end < 0:
+                    return False
+                self._body_start = end + len("</think>")
+            elif "<think>".startswith(stripped):
+                # Too little text yet to tell whether a think block follows
+                return False
+            else:
+                self._body_start = offset
+        bracket = self._buffer.find("[", self._body_start)
+        if bracket < 0:
+            return False
+        self._pos = bracket + 1
+        return True
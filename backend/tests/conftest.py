@@ -1,64 +1,156 @@
+import asyncio
+import httpx
 import pytest
-import tempfile
-import os
-import sys
-from pathlib import Path
-from sqlalchemy import create_engine
+import respx
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
-# Add the backend directory to Python path
-backend_dir = Path(__file__).parent.parent
-sys.path.insert(0, str(backend_dir))
-
-from main import app
+import database
+import models  # Registers every table on Base.metadata for create_all
 from database import get_db, Base
 
-# Create a temporary test database
+LIVE_API_URL = "http://localhost:8010"
+
+@pytest.fixture(scope="module")
+def event_loop():
+    """Share one event loop across each module's async tests"""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+# Create an in-memory test database
 @pytest.fixture(scope="session")
 def test_db():
-    """Create a temporary test database"""
-    # Use a more Windows-friendly approach for temp files
-    import tempfile
-    temp_dir = tempfile.gettempdir()
-    temp_file_path = os.path.join(temp_dir, f"test_motivate_ai_{os.getpid()}.db")
-    test_db_url = f"sqlite:///{temp_file_path}"
-        
-    engine = create_engine(test_db_url, connect_args={"check_same_thread": False})
+    """Create an in-memory test database shared by the whole session"""
+    # Each pytest-xdist worker is a separate process with its own in-memory
+    # database, so workers never share or race on a schema
+    # StaticPool keeps the single in-memory connection alive across threads.
+    # Every session shares that connection, so returning one to the pool must
+    # not roll back the transaction test_client holds open on it.
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+        pool_reset_on_return=None
+    )
+    
+    # Test data is throwaway: skip syncs and keep temp b-trees (sorts,
+    # subquery results) in RAM as well
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+    
     TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     
-    # Create all tables
+    # Create all tables once for the session; the database lives only as long
+    # as the engine, so there is no file to clean up afterwards
     Base.metadata.create_all(bind=engine)
     
-    yield TestingSessionLocal
-    
-    # Cleanup - more robust for Windows
-    try:
-        engine.dispose()  # Close all connections first
-        if os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
-    except (PermissionError, OSError):
-        # On Windows, file might still be in use - that's okay for tests
-        pass
+    # Point the app's own engine and session factory (used by startup's
+    # create_tables and anything outside get_db) at the test database too
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(database, "engine", engine)
+        mp.setattr(database, "SessionLocal", TestingSessionLocal)
+        yield TestingSessionLocal
 
-@pytest.fixture  
-def test_client(test_db):
-    """Create a test client with test database - simplified approach"""
-    def override_get_db():
-        try:
-            db = test_db()
-            yield db
-        finally:
-            db.close()
+@pytest.fixture
+def db_session(test_db, monkeypatch):
+    """Database session whose writes are rolled back after each test"""
+    # Commits land in SAVEPOINTs inside one outer transaction, so the whole
+    # test is undone by a single rollback instead of row cleanup
+    connection = test_db.kw["bind"].connect()
     
-    app.dependency_overrides[get_db] = override_get_db
+    # pysqlite defers BEGIN until the first write, which would let the first
+    # SAVEPOINT open (and its RELEASE commit) the real transaction
+    @event.listens_for(connection, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
     
+    transaction = connection.begin()
+    session = test_db(bind=connection, join_transaction_mode="create_savepoint")
+    
+    # Code that opens its own session via database.get_db (such as the AI
+    # agent's tools) must see the same data as the test
+    def get_test_db():
+        yield session
+    
+    monkeypatch.setattr(database, "get_db", get_test_db)
+    
+    yield session
+    
+    session.close()
+    transaction.rollback()
+    connection.close()
+
+@pytest.fixture(scope="session")
+def app_client(test_db):
+    """Create one test client for the whole session"""
+    # The app is imported here rather than at module level so collecting
+    # tests that never use a client doesn't load the whole backend
     # Use a simpler approach that works with current versions
     try:
         from fastapi.testclient import TestClient
+        from main import app
         client = TestClient(app)
-        yield client
     except Exception:
         # If TestClient fails, skip these tests
         pytest.skip("TestClient compatibility issue - use live API tests instead")
-    finally:
-        app.dependency_overrides.clear() 
\ No newline at end of file
+    
+    # Entering the client runs the app's startup and shutdown handlers once
+    # for the whole session
+    with client:
+        yield client
+
+@pytest.fixture
+def test_client(app_client, db_session):
+    """Test client whose requests use this test's rolled-back db_session"""
+    def override_get_db():
+        yield db_session
+    
+    app = app_client.app
+    app.dependency_overrides[get_db] = override_get_db
+    yield app_client
+    app.dependency_overrides.clear()
+
+@pytest.fixture
+def ollama_generate():
+    """respx route standing in for Ollama's /api/generate; tests set its response"""
+    with respx.mock:
+        yield respx.post("http://localhost:11434/api/generate")
+
+@pytest.fixture(scope="session")
+def has_cors(fastapi_app):
+    """Whether the app's middleware stack includes CORSMiddleware"""
+    return any(getattr(middleware.cls, "__name__", None) == "CORSMiddleware"
+               for middleware in fastapi_app.user_middleware)
+
+@pytest.fixture(scope="session")
+def route_paths(fastapi_app):
+    """Paths of every route registered on the app"""
+    return [route.path for route in fastapi_app.routes]
+
+@pytest.fixture(scope="session")
+def fastapi_app():
+    """The FastAPI app, imported once for the session"""
+    from main import app
+    return app
+
+@pytest.fixture(scope="session")
+def live_api():
+    """Base URL of the running development server; skips when it isn't reachable"""
+    # Probed once; pytest caches the skip for every later test that needs it
+    try:
+        httpx.get(f"{LIVE_API_URL}/health", timeout=0.5)
+    except httpx.HTTPError:
+        pytest.skip("API not running at localhost:8010")
+    return LIVE_API_URL
+
+@pytest.fixture(scope="session")
+def api_client(live_api):
+    """Create one keep-alive HTTP client for the live API"""
+    with httpx.Client(base_url=live_api, timeout=2.0) as client:
+        yield client
@@ -9,41 +9,183 @@ Tests the complete AI agent workflow including:
 """
 
 import pytest
-import sys
+import asyncio
 import json
 import httpx
-from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock, patch
+import respx
 
-# Add the backend directory to Python path
-backend_dir = Path(__file__).parent.parent
-sys.path.insert(0, str(backend_dir))
-
-from fastapi.testclient import TestClient
-from main import app
-from database import get_db, create_tables
 from models.project import Project
 from models.task import Task
-from services.ai_agent_simple import AIAgent, OperationType, get_ai_agent
+from services.ai_agent_simple import AIAgent, AgentRequest, OperationType, get_ai_agent
 
 
-@pytest.fixture
-def test_client():
-    """Create test client with in-memory database"""
-    # Use in-memory SQLite for testing
-    import os
-    os.environ["DATABASE_URL"] = "sqlite:///./test_ai_agent.db"
-    
-    # Create fresh tables
-    create_tables()
-    
-    client = TestClient(app)
-    yield client
+JSON_HEADERS = {"content-type": "application/json"}
 
+# _analyze_task_splitting results for tests that only inspect the stored preview
+ANALYSIS_WITH_CHANGES = {
+    "analysis": {"impact_assessment": "Test impact"},
+    "proposed_changes": [{"action": "test", "reasoning": "test"}],
+    "confidence_score": 0.8,
+    "reasoning_steps": ["Test reasoning"]
+}
+ANALYSIS_WITHOUT_CHANGES = {
+    "analysis": {"impact_assessment": "Test"},
+    "proposed_changes": [],
+    "confidence_score": 0.8,
+    "reasoning_steps": ["Test"]
+}
 
-@pytest.fixture
-def sample_project_and_task(test_client):
-    """Create a sample project and complex task for testing"""
+# Mock analyses for the split_task tests; _for_sample adds the sample row ids
+SPLIT_TASK_ANALYSIS = {
+    "analysis": {
+        "ai_analysis": {
+            "reasoning_steps": [
+                "Task is too large at 240 minutes",
+                "Authentication system has clear sub-components",
+                "Can be broken into logical phases"
+            ],
+            "impact_assessment": "This split will make development more manageable and testable"
+        },
+        "impact_assessment": "This split will make development more manageable and testable",
+        "recommendations": ["Test each component individually", "Focus on security best practices"]
+    },
+    "proposed_changes": [
+        {
+            "action": "create_tasks",
+            "tasks": [
+                {
+                    "title": "Design authentication database schema",
+                    "description": "Create user tables, indexes, and relationships for authentication system",
+                    "estimated_minutes": 45,
+                    "priority": "high",
+                    "energy_level": "medium",
+                    "context": "when you need to think through data structure"
+                },
+                {
+                    "title": "Implement user registration API",
+                    "description": "Build user registration endpoint with validation and email verification",
+                    "estimated_minutes": 60,
+                    "priority": "high",
+                    "energy_level": "high",
+                    "context": "when you have deep focus time"
+                },
+                {
+                    "title": "Implement login and session management",
+                    "description": "Build login endpoint, JWT tokens, and session handling",
+                    "estimated_minutes": 75,
+                    "priority": "high",
+                    "energy_level": "high",
+                    "context": "when you have deep focus time"
+                },
+                {
+                    "title": "Add password reset functionality",
+                    "description": "Implement password reset flow with secure token generation",
+                    "estimated_minutes": 45,
+                    "priority": "medium",
+                    "energy_level": "medium",
+                    "context": "when you have moderate focus"
+                },
+                {
+                    "title": "Build user profile management",
+                    "description": "Create user profile update endpoints and validation",
+                    "estimated_minutes": 30,
+                    "priority": "medium",
+                    "energy_level": "medium",
+                    "context": "anytime"
+                }
+            ],
+            "reasoning": "Split into logical development phases: schema design, core auth, secondary features"
+        },
+        {
+            "action": "delete_task",
+            "reasoning": "Original task replaced by 5 focused subtasks"
+        }
+    ],
+    "confidence_score": 0.9,
+    "reasoning_steps": [
+        "Task is too large at 240 minutes",
+        "Authentication system has clear sub-components",
+        "Can be broken into logical phases",
+        "Each subtask is 30-75 minutes, ideal for focused work"
+    ]
+}
+
+EXECUTION_SUBTASKS = [
+    {
+        "title": "Plan authentication system",
+        "description": "Design the overall authentication architecture",
+        "estimated_minutes": 30,
+        "priority": "high",
+        "energy_level": "medium",
+        "context": "when thinking through architecture"
+    },
+    {
+        "title": "Implement user registration",
+        "description": "Build user registration with validation",
+        "estimated_minutes": 60,
+        "priority": "high",
+        "energy_level": "high",
+        "context": "when you have focus time"
+    }
+]
+
+EXECUTION_ANALYSIS = {
+    "analysis": {
+        "impact_assessment": "Breaking down large task improves manageability",
+        "recommendations": ["Focus on one component at a time"]
+    },
+    "proposed_changes": [
+        {
+            "action": "create_tasks",
+            "tasks": EXECUTION_SUBTASKS,
+            "reasoning": "Split into manageable components"
+        },
+        {
+            "action": "delete_task",
+            "reasoning": "Replace with subtasks"
+        }
+    ],
+    "confidence_score": 0.85,
+    "reasoning_steps": [
+        "Original task is too large at 240 minutes",
+        "Can be split into logical components",
+        "Each subtask is appropriately sized"
+    ]
+}
+
+
+def _for_sample(analysis, project, task):
+    """Copy a mock analysis with the sample project and task ids filled in"""
+    proposed_changes = []
+    for change in analysis["proposed_changes"]:
+        if change["action"] == "create_tasks":
+            change = {**change, "tasks": [{**subtask, "project_id": project["id"]} for subtask in change["tasks"]]}
+        elif change["action"] == "delete_task":
+            change = {**change, "task_id": task["id"]}
+        proposed_changes.append(change)
+    return {**analysis, "proposed_changes": proposed_changes}
+
+
+def _stub_analysis(result):
+    """Stand-in for AIAgent._analyze_task_splitting that returns result"""
+    async def analyze(self, gathered_data, request):
+        return result
+    return analyze
+
+
+@pytest.fixture(autouse=True)
+def _stub_analyze(monkeypatch):
+    """Keep every test off the real, model-backed task split analysis"""
+    # Tests that need a particular analysis set their own stub on top
+    monkeypatch.setattr(AIAgent, "_analyze_task_splitting", _stub_analysis(ANALYSIS_WITHOUT_CHANGES))
+
+
+@pytest.fixture(scope="module")
+def sample_project_and_task(test_db):
+    """Create a sample project and complex task shared by this module's tests"""
+    # Committed outside each test's rolled-back transaction, so changes a
+    # test makes through the API are undone while these rows stay put
+    db = test_db()
     
     # Create a project
     project_data = {
@@ -51,10 +193,10 @@ def sample_project_and_task(test_client):
         "description": "Complete overhaul of company website",
         "location": "Remote"
     }
-    
-    project_response = test_client.post("/api/v1/projects", json=project_data)
-    assert project_response.status_code == 200
-    project = project_response.json()
+    project_row = Project(**project_data)
+    db.add(project_row)
+    db.flush()
+    project = {"id": project_row.id, **project_data}
     
     # Create a complex task that needs splitting
     task_data = {
@@ -66,12 +208,18 @@ def sample_project_and_task(test_client):
         "energy_level": "high",
         "context": "when you have deep focus time"
     }
+    task_row = Task(**task_data)
+    db.add(task_row)
+    db.flush()
+    task = {"id": task_row.id, **task_data}
+    db.commit()
     
-    task_response = test_client.post("/api/v1/tasks", json=task_data)
-    assert task_response.status_code == 200
-    task = task_response.json()
+    yield project, task
     
-    return project, task
+    db.query(Task).filter(Task.project_id == project["id"]).delete()
+    db.query(Project).filter(Project.id == project["id"]).delete()
+    db.commit()
+    db.close()
 
 
 def test_ai_agent_status(test_client):
@@ -104,7 +252,7 @@ def test_ai_agent_supported_operations(test_client):
     assert "task_ids" in split_task_op["required_inputs"]
 
 
-def test_ai_agent_preview_creation(test_client, sample_project_and_task):
+def test_ai_agent_preview_creation(test_client, sample_project_and_task, monkeypatch):
     """Test creating an AI agent preview for task splitting"""
     project, task = sample_project_and_task
     
@@ -119,349 +267,196 @@ def test_ai_agent_preview_creation(test_client, sample_project_and_task):
     }
     
     # Mock the AI service to avoid needing actual Ollama
-    with patch.object(AIAgent, '_analyze_task_splitting') as mock_analyze:
-        # Mock AI response
-        mock_analyze.return_value = {
-            "analysis": {
-                "ai_analysis": {
-                    "reasoning_steps": [
-                        "Task is too large at 240 minutes",
-                        "Authentication system has clear sub-components",
-                        "Can be broken into logical phases"
-                    ],
-                    "impact_assessment": "This split will make development more manageable and testable"
-                },
-                "impact_assessment": "This split will make development more manageable and testable",
-                "recommendations": ["Test each component individually", "Focus on security best practices"]
-            },
-            "proposed_changes": [
-                {
-                    "action": "create_tasks",
-                    "tasks": [
-                        {
-                            "title": "Design authentication database schema",
-                            "description": "Create user tables, indexes, and relationships for authentication system",
-                            "estimated_minutes": 45,
-                            "priority": "high",
-                            "energy_level": "medium",
-                            "context": "when you need to think through data structure",
-                            "project_id": project["id"]
-                        },
-                        {
-                            "title": "Implement user registration API",
-                            "description": "Build user registration endpoint with validation and email verification",
-                            "estimated_minutes": 60,
-                            "priority": "high",
-                            "energy_level": "high",
-                            "context": "when you have deep focus time",
-                            "project_id": project["id"]
-                        },
-                        {
-                            "title": "Implement login and session management",
-                            "description": "Build login endpoint, JWT tokens, and session handling",
-                            "estimated_minutes": 75,
-                            "priority": "high",
-                            "energy_level": "high",
-                            "context": "when you have deep focus time",
-                            "project_id": project["id"]
-                        },
-                        {
-                            "title": "Add password reset functionality",
-                            "description": "Implement password reset flow with secure token generation",
-                            "estimated_minutes": 45,
-                            "priority": "medium",
-                            "energy_level": "medium",
-                            "context": "when you have moderate focus",
-                            "project_id": project["id"]
-                        },
-                        {
-                            "title": "Build user profile management",
-                            "description": "Create user profile update endpoints and validation",
-                            "estimated_minutes": 30,
-                            "priority": "medium",
-                            "energy_level": "medium",
-                            "context": "anytime",
-                            "project_id": project["id"]
-                        }
-                    ],
-                    "reasoning": "Split into logical development phases: schema design, core auth, secondary features"
-                },
-                {
-                    "action": "delete_task",
-                    "task_id": task["id"],
-                    "reasoning": "Original task replaced by 5 focused subtasks"
-                }
-            ],
-            "confidence_score": 0.9,
-            "reasoning_steps": [
-                "Task is too large at 240 minutes",
-                "Authentication system has clear sub-components",
-                "Can be broken into logical phases",
-                "Each subtask is 30-75 minutes, ideal for focused work"
-            ]
-        }
+    analysis = _for_sample(SPLIT_TASK_ANALYSIS, project, task)
+    monkeypatch.setattr(AIAgent, "_analyze_task_splitting", _stub_analysis(analysis))
         
-        response = test_client.post("/api/v1/ai-agent/preview", json=preview_request)
-        assert response.status_code == 200
+    response = test_client.post("/api/v1/ai-agent/preview", json=preview_request)
+    assert response.status_code == 200
         
-        preview = response.json()
-        assert preview["operation"] == "split_task"
-        assert preview["confidence_score"] == 0.9
-        assert len(preview["proposed_changes"]) == 2  # create_tasks + delete_task
-        assert "preview_id" in preview
+    preview = response.json()
+    assert preview["operation"] == "split_task"
+    assert preview["confidence_score"] == 0.9
+    assert len(preview["proposed_changes"]) == 2  # create_tasks + delete_task
+    assert "preview_id" in preview
         
-        # Verify the proposed subtasks
-        create_action = next(
-            change for change in preview["proposed_changes"] 
-            if change["action"] == "create_tasks"
-        )
-        subtasks = create_action["tasks"]
-        assert len(subtasks) == 5
+    # Verify the proposed subtasks
+    create_action = next(
+        change for change in preview["proposed_changes"] 
+        if change["action"] == "create_tasks"
+    )
+    subtasks = create_action["tasks"]
+    assert len(subtasks) == 5
         
-        # Check that all subtasks are reasonably sized
-        for subtask in subtasks:
-            assert 30 <= subtask["estimated_minutes"] <= 75
-            assert subtask["project_id"] == project["id"]
-            assert subtask["title"] is not None
-            assert subtask["description"] is not None
+    # Check that all subtasks are reasonably sized
+    for subtask in subtasks:
+        assert 30 <= subtask["estimated_minutes"] <= 75
+        assert subtask["project_id"] == project["id"]
+        assert subtask["title"] is not None
+        assert subtask["description"] is not None
         
-        return preview
+    return preview
 
 
-def test_ai_agent_preview_details(test_client, sample_project_and_task):
-    """Test getting preview details"""
+@pytest.fixture(scope="module")
+def split_request_body(sample_project_and_task):
+    """split_task preview request for the sample task, serialised once per module"""
     project, task = sample_project_and_task
-    
-    # First create a preview
-    preview_request = {
+    return json.dumps({
         "operation": "split_task",
         "task_ids": [task["id"]]
-    }
+    }).encode()
+
+
+@pytest.fixture
+def created_preview(test_client, split_request_body, monkeypatch, request):
+    """Create a split_task preview whose analysis is the parametrized result"""
+    monkeypatch.setattr(AIAgent, "_analyze_task_splitting", _stub_analysis(request.param))
+    preview_response = test_client.post("/api/v1/ai-agent/preview",
+                                        content=split_request_body, headers=JSON_HEADERS)
+    assert preview_response.status_code == 200
+    return preview_response.json()
+
+
+@pytest.mark.parametrize("created_preview", [ANALYSIS_WITH_CHANGES, ANALYSIS_WITHOUT_CHANGES], indirect=True)
+def test_ai_agent_preview_details(test_client, created_preview):
+    """Test getting preview details"""
+    preview_id = created_preview["preview_id"]
     
-    with patch.object(AIAgent, '_analyze_task_splitting') as mock_analyze:
-        mock_analyze.return_value = {
-            "analysis": {"impact_assessment": "Test impact"},
-            "proposed_changes": [{"action": "test", "reasoning": "test"}],
-            "confidence_score": 0.8,
-            "reasoning_steps": ["Test reasoning"]
-        }
-        
-        preview_response = test_client.post("/api/v1/ai-agent/preview", json=preview_request)
-        preview = preview_response.json()
-        preview_id = preview["preview_id"]
-        
-        # Get preview details
-        details_response = test_client.get(f"/api/v1/ai-agent/preview/{preview_id}")
-        assert details_response.status_code == 200
-        
-        details = details_response.json()
-        assert details["preview_id"] == preview_id
-        assert details["operation"] == "split_task"
-        assert details["status"] == "pending_approval"
+    # Get preview details
+    details_response = test_client.get(f"/api/v1/ai-agent/preview/{preview_id}")
+    assert details_response.status_code == 200
+    
+    details = details_response.json()
+    assert details["preview_id"] == preview_id
+    assert details["operation"] == "split_task"
+    assert details["status"] == "pending_approval"
 
 
-def test_ai_agent_preview_cancellation(test_client, sample_project_and_task):
+@pytest.mark.parametrize("created_preview", [ANALYSIS_WITH_CHANGES, ANALYSIS_WITHOUT_CHANGES], indirect=True)
+def test_ai_agent_preview_cancellation(test_client, created_preview):
     """Test cancelling a preview"""
-    project, task = sample_project_and_task
+    preview_id = created_preview["preview_id"]
     
-    # Create a preview
-    preview_request = {
-        "operation": "split_task",
-        "task_ids": [task["id"]]
-    }
+    # Cancel the preview
+    cancel_response = test_client.delete(f"/api/v1/ai-agent/preview/{preview_id}")
+    assert cancel_response.status_code == 200
     
-    with patch.object(AIAgent, '_analyze_task_splitting') as mock_analyze:
-        mock_analyze.return_value = {
-            "analysis": {"impact_assessment": "Test"},
-            "proposed_changes": [],
-            "confidence_score": 0.8,
-            "reasoning_steps": ["Test"]
-        }
-        
-        preview_response = test_client.post("/api/v1/ai-agent/preview", json=preview_request)
-        preview = preview_response.json()
-        preview_id = preview["preview_id"]
-        
-        # Cancel the preview
-        cancel_response = test_client.delete(f"/api/v1/ai-agent/preview/{preview_id}")
-        assert cancel_response.status_code == 200
-        
-        # Verify it's deleted
-        details_response = test_client.get(f"/api/v1/ai-agent/preview/{preview_id}")
-        assert details_response.status_code == 404
+    # Verify it's deleted
+    details_response = test_client.get(f"/api/v1/ai-agent/preview/{preview_id}")
+    assert details_response.status_code == 404
 
 
-def test_ai_agent_full_execution_workflow(test_client, sample_project_and_task):
+@pytest.mark.asyncio
+async def test_ai_agent_full_execution_workflow(db_session, sample_project_and_task, monkeypatch):
     """Test the complete AI agent workflow from preview to execution"""
     project, task = sample_project_and_task
+    agent = get_ai_agent()
     
     # Step 1: Create preview
-    preview_request = {
-        "operation": "split_task",
-        "task_ids": [task["id"]],
-        "context": {"test": "full_workflow"}
-    }
+    preview_request = AgentRequest(
+        operation=OperationType.SPLIT_TASK,
+        task_ids=[task["id"]],
+        context={"test": "full_workflow"}
+    )
     
-    subtasks_data = [
-        {
-            "title": "Plan authentication system",
-            "description": "Design the overall authentication architecture",
-            "estimated_minutes": 30,
-            "priority": "high",
-            "energy_level": "medium",
-            "context": "when thinking through architecture",
-            "project_id": project["id"]
-        },
-        {
-            "title": "Implement user registration",
-            "description": "Build user registration with validation",
-            "estimated_minutes": 60,
-            "priority": "high",
-            "energy_level": "high",
-            "context": "when you have focus time",
-            "project_id": project["id"]
-        }
-    ]
+    analysis = _for_sample(EXECUTION_ANALYSIS, project, task)
+    monkeypatch.setattr(AIAgent, "_analyze_task_splitting", _stub_analysis(analysis))
     
-    with patch.object(AIAgent, '_analyze_task_splitting') as mock_analyze:
-        mock_analyze.return_value = {
-            "analysis": {
-                "impact_assessment": "Breaking down large task improves manageability",
-                "recommendations": ["Focus on one component at a time"]
-            },
-            "proposed_changes": [
-                {
-                    "action": "create_tasks",
-                    "tasks": subtasks_data,
-                    "reasoning": "Split into manageable components"
-                },
-                {
-                    "action": "delete_task",
-                    "task_id": task["id"],
-                    "reasoning": "Replace with subtasks"
-                }
-            ],
-            "confidence_score": 0.85,
-            "reasoning_steps": [
-                "Original task is too large at 240 minutes",
-                "Can be split into logical components",
-                "Each subtask is appropriately sized"
-            ]
-        }
-        
-        preview_response = test_client.post("/api/v1/ai-agent/preview", json=preview_request)
-        assert preview_response.status_code == 200
-        preview = preview_response.json()
-        preview_id = preview["preview_id"]
-        
-        # Step 2: Execute the preview
-        # Mock the API calls that the agent would make
-        with patch('httpx.post') as mock_post, \
-             patch('httpx.delete') as mock_delete:
-            
-            # Mock successful task creation
-            mock_post.return_value = MagicMock(
-                status_code=200,
-                json=lambda: {
-                    "message": "Tasks created successfully",
-                    "tasks": [
-                        {"id": 100, "title": "Plan authentication system"},
-                        {"id": 101, "title": "Implement user registration"}
-                    ]
-                }
-            )
-            
-            # Mock successful task deletion
-            mock_delete.return_value = MagicMock(
-                status_code=200,
-                json=lambda: {"message": f"Task {task['id']} deleted successfully"}
-            )
-            
-            execution_response = test_client.post(f"/api/v1/ai-agent/execute/{preview_id}")
-            assert execution_response.status_code == 200
-            
-            execution_result = execution_response.json()
-            assert execution_result["success"] is True
-            assert execution_result["operation"] == "split_task"
-            assert "executed_changes" in execution_result
-            assert "execution_id" in execution_result
-            
-            # Verify the API calls were made
-            assert mock_post.called
-            assert mock_delete.called
-            
-            # Verify the preview is cleaned up
-            details_response = test_client.get(f"/api/v1/ai-agent/preview/{preview_id}")
-            assert details_response.status_code == 404
-
-
-def test_ai_agent_error_handling(test_client, sample_project_and_task):
-    """Test AI agent error handling scenarios"""
-    project, task = sample_project_and_task
+    preview = await agent.process_request(preview_request)
+    assert preview.operation == "split_task"
+    assert preview.confidence_score == 0.85
     
-    # Test invalid operation
-    invalid_request = {
-        "operation": "invalid_operation",
-        "task_ids": [task["id"]]
-    }
+    # Step 2: Execute the preview; the agent's tools write through database.get_db,
+    # which db_session points at this test's rolled-back session
+    execution_result = await agent.execute_approved_preview(preview)
     
-    response = test_client.post("/api/v1/ai-agent/preview", json=invalid_request)
-    assert response.status_code == 400
-    assert "Unsupported operation" in response.json()["detail"]
+    assert execution_result.success is True
+    assert execution_result.operation == "split_task"
+    assert execution_result.executed_changes is not None
     
-    # Test missing task_ids for split_task
-    missing_ids_request = {
-        "operation": "split_task",
-        "task_ids": []
+    # The subtasks now exist under the project and the original task is gone
+    created_titles = {
+        title for (title,) in db_session.query(Task.title).filter(Task.project_id == project["id"])
     }
+    assert {subtask["title"] for subtask in EXECUTION_SUBTASKS} <= created_titles
+    assert db_session.get(Task, task["id"]) is None
+
+
+@pytest.mark.asyncio
+async def test_generate_survives_cancelled_first_caller():
+    """Test cancelling the caller that started a coalesced generate leaves the others waiting"""
+    agent = AIAgent()
+    release = asyncio.Event()
     
-    response = test_client.post("/api/v1/ai-agent/preview", json=missing_ids_request)
-    assert response.status_code == 400
-    assert "task_ids are required" in response.json()["detail"]
+    async def slow_generate(request):
+        await release.wait()
+        return httpx.Response(200, json={"response": "shared answer"})
     
-    # Test executing non-existent preview
-    fake_preview_id = "fake-preview-id-12345"
-    response = test_client.post(f"/api/v1/ai-agent/execute/{fake_preview_id}")
-    assert response.status_code == 404
-    assert "not found" in response.json()["detail"]
+    with respx.mock:
+        route = respx.post(f"{agent.ollama_base_url}/api/generate").mock(side_effect=slow_generate)
+        
+        leader = asyncio.create_task(agent._generate("same prompt", {}))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(agent._generate("same prompt", {}))
+        await asyncio.sleep(0)
+        
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        
+        release.set()
+        assert await waiter == "shared answer"
+        assert route.call_count == 1
+        assert agent._inflight == {}
 
 
-def test_ai_agent_fallback_analysis(test_client, sample_project_and_task):
-    """Test AI agent fallback when AI service is unavailable"""
+@pytest.mark.parametrize("build_payload,url,expected_status,expected_msg", [
+    (lambda task: {"operation": "invalid_operation", "task_ids": [task["id"]]},
+     "/api/v1/ai-agent/preview", 400, "Unsupported operation"),
+    (lambda task: {"operation": "split_task", "task_ids": []},
+     "/api/v1/ai-agent/preview", 400, "task_ids are required"),
+    (lambda task: None,
+     "/api/v1/ai-agent/execute/fake-preview-id-12345", 404, "not found"),
+], ids=["invalid_operation", "missing_task_ids", "unknown_preview"])
+def test_ai_agent_error_handling(test_client, sample_project_and_task,
+                                 build_payload, url, expected_status, expected_msg):
+    """Test AI agent error handling scenarios"""
     project, task = sample_project_and_task
     
-    preview_request = {
-        "operation": "split_task",
-        "task_ids": [task["id"]]
-    }
-    
+    response = test_client.post(url, json=build_payload(task))
+    assert response.status_code == expected_status
+    assert expected_msg in response.json()["detail"]
+
+
+def test_ai_agent_fallback_analysis(test_client, split_request_body, monkeypatch):
+    """Test AI agent fallback when AI service is unavailable"""
     # Mock AI service failure to trigger fallback
-    with patch.object(AIAgent, '_analyze_task_splitting') as mock_analyze:
-        # Mock the method to call the fallback directly
-        agent = get_ai_agent()
-        mock_analyze.side_effect = lambda gathered_data, request: agent._fallback_task_analysis(
-            gathered_data, request.get("task_ids", [])
-        )
+    # Mock the method to call the fallback directly
+    async def fallback_analysis(self, gathered_data, request):
+        return self._fallback_task_analysis(gathered_data, request.get("task_ids", []))
+    
+    monkeypatch.setattr(AIAgent, "_analyze_task_splitting", fallback_analysis)
         
-        response = test_client.post("/api/v1/ai-agent/preview", json=preview_request)
-        assert response.status_code == 200
+    response = test_client.post("/api/v1/ai-agent/preview",
+                                content=split_request_body, headers=JSON_HEADERS)
+    assert response.status_code == 200
         
-        preview = response.json()
-        assert preview["operation"] == "split_task"
-        assert preview["confidence_score"] == 0.6  # Fallback confidence
+    preview = response.json()
+    assert preview["operation"] == "split_task"
+    assert preview["confidence_score"] == 0.6  # Fallback confidence
         
-        # Verify fallback creates plan-execute-review pattern
-        create_action = next(
-            change for change in preview["proposed_changes"] 
-            if change["action"] == "create_tasks"
-        )
-        subtasks = create_action["tasks"]
-        assert len(subtasks) == 3
+    # Verify fallback creates plan-execute-review pattern
+    create_action = next(
+        change for change in preview["proposed_changes"] 
+        if change["action"] == "create_tasks"
+    )
+    subtasks = create_action["tasks"]
+    assert len(subtasks) == 3
         
-        titles = [task["title"] for task in subtasks]
-        assert any("Plan:" in title for title in titles)
-        assert any("Execute:" in title for title in titles)
-        assert any("Review:" in title for title in titles)
+    titles = [task["title"] for task in subtasks]
+    assert any("Plan:" in title for title in titles)
+    assert any("Execute:" in title for title in titles)
+    assert any("Review:" in title for title in titles)
 
 
 if __name__ == "__main__":
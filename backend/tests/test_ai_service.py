@@ -1,88 +1,184 @@
 import pytest
-import sys
-from pathlib import Path
-from unittest.mock import Mock, patch, AsyncMock
+import asyncio
+import json
+from unittest.mock import patch
 import httpx
-
-# Add the backend directory to Python path
-backend_dir = Path(__file__).parent.parent
-sys.path.insert(0, str(backend_dir))
+import respx
 
 from services.ai_service import AIService
+from services.ollama_utils import dumps_json, loads_json
+
+@pytest.fixture
+def ai_service():
+    """A fresh AI service, so caches and connection state don't leak between tests"""
+    return AIService()
 
 class TestAIService:
     """Test suite for AI service functionality"""
     
-    def setup_method(self):
-        """Set up test fixtures"""
-        self.ai_service = AIService()
-        
-    def test_ai_service_initialization(self):
+    def test_ai_service_initialization(self, monkeypatch):
         """Test AI service initializes with correct defaults"""
-        assert self.ai_service.base_url == "http://localhost:11434"
-        assert self.ai_service.model == "qwen3max:latest"
-        assert self.ai_service.timeout == 600
+        monkeypatch.delenv("OLLAMA_BASE_URL", raising=False)
+        monkeypatch.delenv("AI_MODEL", raising=False)
+        # The shared config's value, set here rather than relying on some
+        # other module having loaded config.env.example first
+        monkeypatch.setenv("OLLAMA_TIMEOUT", "600")
+        ai_service = AIService()
+        
+        assert ai_service.base_url == "http://localhost:11434"
+        assert ai_service.model == "qwen3max:latest"
+        assert ai_service.timeout == 600
         
     @pytest.mark.asyncio
-    async def test_generate_suggestions_success(self):
+    async def test_generate_suggestions_success(self, ai_service, ollama_generate):
         """Test successful AI suggestion generation"""
         # Mock the HTTP response
         mock_response = {
             "response": '[{"title": "Test Task", "description": "Test description", "estimated_minutes": 15, "energy_level": "medium", "context": "when focused", "reasoning": "Good for progress"}]'
         }
         
-        with patch.object(httpx.AsyncClient, 'post', new_callable=AsyncMock) as mock_post:
-            mock_post.return_value.json.return_value = mock_response
-            mock_post.return_value.status_code = 200
-            
-            suggestions = await self.ai_service.generate_project_suggestions(
-                "Test Project", 
-                "Test description"
-            )
-            
-            assert len(suggestions) == 1
-            assert suggestions[0]["title"] == "Test Task"
-            assert suggestions[0]["estimated_minutes"] == 15
+        ollama_generate.mock(return_value=httpx.Response(200, json=mock_response))
+        
+        suggestions = await ai_service.generate_project_suggestions(
+            "Test Project", 
+            "Test description"
+        )
+        
+        assert len(suggestions) == 1
+        assert suggestions[0]["title"] == "Test Task"
+        assert suggestions[0]["estimated_minutes"] == 15
             
     @pytest.mark.asyncio
-    async def test_generate_suggestions_ollama_error(self):
+    async def test_generate_suggestions_ollama_error(self, ai_service, ollama_generate):
         """Test AI service handles Ollama connection errors gracefully"""
-        with patch.object(httpx.AsyncClient, 'post', new_callable=AsyncMock) as mock_post:
-            mock_post.side_effect = httpx.ConnectError("Connection failed")
-            
-            suggestions = await self.ai_service.generate_project_suggestions("Test Project")
+        ollama_generate.mock(side_effect=httpx.ConnectError("Connection failed"))
+        
+        suggestions = await ai_service.generate_project_suggestions("Test Project")
+        
+        # Should return fallback suggestions
+        assert len(suggestions) > 0
+        assert all("title" in suggestion for suggestion in suggestions)
             
-            # Should return fallback suggestions
-            assert len(suggestions) > 0
-            assert all("title" in suggestion for suggestion in suggestions)
+    @pytest.mark.asyncio
+    async def test_generate_suggestions_error_status_uses_fallback(self, ai_service, ollama_generate):
+        """Test an Ollama error status returns fallback suggestions without caching"""
+        ollama_generate.mock(return_value=httpx.Response(500, json={"error": "model not loaded"}))
+        
+        suggestions = await ai_service.generate_project_suggestions("Error Project")
+        
+        assert suggestions == ai_service._get_fallback_suggestions("Error Project")
+        assert len(ai_service.cache) == 0
             
     @pytest.mark.asyncio
-    async def test_generate_suggestions_with_context(self):
+    async def test_generate_suggestions_with_context(self, ai_service, ollama_generate):
         """Test AI suggestion generation with full context"""
         mock_response = {
             "response": '[{"title": "Organize tools", "description": "Sort screwdrivers", "estimated_minutes": 10, "energy_level": "low", "context": "quick win", "reasoning": "Creates visible progress"}]'
         }
         
-        with patch.object(httpx.AsyncClient, 'post', new_callable=AsyncMock) as mock_post:
-            mock_post.return_value.json.return_value = mock_response
-            mock_post.return_value.status_code = 200
+        route = ollama_generate.mock(return_value=httpx.Response(200, json=mock_response))
+        
+        suggestions = await ai_service.generate_project_suggestions(
+            "Garage Organization", 
+            "Organize all my tools and equipment",
+            "garage",
+            "sort through toolbox"
+        )
+        
+        # Verify the service was called with proper context
+        assert route.call_count == 1
+        prompt = json.loads(route.calls.last.request.content)["prompt"]
+        assert "Garage Organization" in prompt
+        assert "garage" in prompt
             
-            suggestions = await self.ai_service.generate_project_suggestions(
-                "Garage Organization", 
-                "Organize all my tools and equipment",
-                "garage",
-                "sort through toolbox"
+    @pytest.mark.asyncio
+    async def test_generate_suggestions_bulk(self, ai_service):
+        """Test bulk generation returns one suggestion list per project, in order"""
+        async def fake_post_generate(prompt, options):
+            title = "Garage" if "Garage Organization" in prompt else "Kitchen"
+            return f'[{{"title": "{title} task", "description": "d", "estimated_minutes": 5, "energy_level": "low"}}]'
+        
+        with patch.object(ai_service, '_post_generate', side_effect=fake_post_generate) as mock_post:
+            results = await ai_service.generate_project_suggestions_bulk([
+                {"title": "Garage Organization", "location": "garage"},
+                {"title": "Kitchen Renovation"}
+            ])
+            
+            assert mock_post.call_count == 2
+            assert [r[0]["title"] for r in results] == ["Garage task", "Kitchen task"]
+            
+    @pytest.mark.asyncio
+    async def test_generate_suggestions_bulk_respects_num_parallel(self, ollama_generate):
+        """Test bulk generation never has more than num_parallel requests in flight"""
+        in_flight = 0
+        peak = 0
+        
+        async def slow_generate(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200, json={"response": '[{"title": "Task"}]'})
+        
+        ollama_generate.mock(side_effect=slow_generate)
+        service = AIService()
+        service.num_parallel = 2
+        results = await service.generate_project_suggestions_bulk(
+            [{"title": f"Project {i}"} for i in range(5)]
+        )
+        
+        assert len(results) == 5
+        assert peak == 2
+            
+    @pytest.mark.asyncio
+    async def test_stream_and_bulk_share_num_parallel(self, ollama_generate):
+        """Test a streamed generation takes a slot, so it and bulk calls stay within num_parallel"""
+        in_flight = 0
+        peak = 0
+        
+        async def slow_generate(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if loads_json(request.content)["stream"]:
+                body = dumps_json({"response": '[{"title": "Streamed"}]', "done": True}) + b"\n"
+                return httpx.Response(200, content=body)
+            return httpx.Response(200, json={"response": '[{"title": "Task"}]'})
+        
+        ollama_generate.mock(side_effect=slow_generate)
+        service = AIService()
+        service.num_parallel = 1
+        
+        async def collect_stream():
+            return [s async for s in service.stream_project_suggestions("Streamed Project")]
+        
+        streamed, bulk = await asyncio.gather(
+            collect_stream(),
+            service.generate_project_suggestions_bulk([{"title": f"Project {i}"} for i in range(3)])
+        )
+        
+        assert streamed == [{"title": "Streamed"}]
+        assert len(bulk) == 3
+        assert peak == 1
+            
+    @pytest.mark.asyncio
+    async def test_connection_result_is_cached(self, ai_service):
+        """Test repeated connection checks reuse the last /api/tags result"""
+        with respx.mock:
+            tags = respx.get(f"{ai_service.base_url}/api/tags").mock(
+                return_value=httpx.Response(200, json={"models": [{"name": ai_service.model}]})
             )
             
-            # Verify the service was called with proper context
-            mock_post.assert_called_once()
-            call_args = mock_post.call_args
-            assert "Garage Organization" in call_args[1]["json"]["prompt"]
-            assert "garage" in call_args[1]["json"]["prompt"]
+            assert await ai_service.test_connection() is True
+            assert await ai_service.test_connection() is True
+            assert tags.call_count == 1
             
-    def test_health_check(self):
+    def test_health_check(self, ai_service):
         """Test AI service health check functionality"""
-        health_status = self.ai_service.check_health()
+        health_status = ai_service.check_health()
         assert "ollama_connected" in health_status
         assert "model_available" in health_status
         assert isinstance(health_status["ollama_connected"], bool) 
\ No newline at end of file
@@ -5,32 +5,58 @@ Tests the enhanced task API with CRUD operations, bulk creation,
 AI tools service, and task splitting functionality.
 """
 
+import httpx
 import pytest
-import sys
-from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy import event
 
-# Add the backend directory to Python path
-backend_dir = Path(__file__).parent.parent
-sys.path.insert(0, str(backend_dir))
-
-from fastapi.testclient import TestClient
 from services.ai_tools import AITaskTools, get_ai_tools
 from services.ai_service import AIService
+from services.ollama_utils import dumps_json, loads_json
 from models.task import Task
 from models.project import Project
 
+# /api/generate body for the mocked split, encoded once for every request
+SPLIT_GENERATE_BODY = dumps_json({
+    "response": '''[
+        {
+            "title": "Plan the complex task approach",
+            "description": "Spend time planning how to tackle the complex task",
+            "estimated_minutes": 15,
+            "energy_level": "medium",
+            "context": "when you need to get started",
+            "reasoning": "Planning reduces overwhelm"
+        },
+        {
+            "title": "Execute first phase of task",
+            "description": "Begin working on the first part of the complex task",
+            "estimated_minutes": 20,
+            "energy_level": "high",
+            "context": "when you have focus",
+            "reasoning": "Breaking into phases makes it manageable"
+        },
+        {
+            "title": "Complete and review task",
+            "description": "Finish the task and review the results",
+            "estimated_minutes": 25,
+            "energy_level": "medium",
+            "context": "anytime",
+            "reasoning": "Proper completion ensures quality"
+        }
+    ]'''
+})
+
+
+@pytest.fixture
+def project_id(db_session):
+    """Id of a project for task tests, inserted directly rather than through the API"""
+    project = Project(title="Task Test Project", description="Project for task tests")
+    db_session.add(project)
+    db_session.flush()
+    return project.id
+
 
-def test_get_single_task(test_client):
+def test_get_single_task(test_client, project_id):
     """Test getting a single task by ID"""
-    # First create a project
-    project_response = test_client.post("/api/v1/projects", json={
-        "title": "Test Project",
-        "description": "Test project for task testing"
-    })
-    assert project_response.status_code == 200
-    project_id = project_response.json()["id"]
-    
     # Create a task
     task_response = test_client.post("/api/v1/tasks", json={
         "project_id": project_id,
@@ -55,14 +81,9 @@ def test_get_single_task(test_client):
     assert task_data["energy_level"] == "medium"
 
 
-def test_update_task(test_client):
+def test_update_task(test_client, project_id):
     """Test updating a task"""
-    # Create project and task
-    project_response = test_client.post("/api/v1/projects", json={
-        "title": "Update Test Project"
-    })
-    project_id = project_response.json()["id"]
-    
+    # Create a task
     task_response = test_client.post("/api/v1/tasks", json={
         "project_id": project_id,
         "title": "Original Task",
@@ -86,14 +107,9 @@ def test_update_task(test_client):
     assert updated_task["priority"] == "low"
 
 
-def test_delete_task(test_client):
+def test_delete_task(test_client, project_id):
     """Test deleting a task"""
-    # Create project and task
-    project_response = test_client.post("/api/v1/projects", json={
-        "title": "Delete Test Project"
-    })
-    project_id = project_response.json()["id"]
-    
+    # Create a task
     task_response = test_client.post("/api/v1/tasks", json={
         "project_id": project_id,
         "title": "Task to Delete"
@@ -110,14 +126,8 @@ def test_delete_task(test_client):
     assert get_response.status_code == 404
 
 
-def test_bulk_task_creation(test_client):
+def test_bulk_task_creation(test_client, project_id):
     """Test creating multiple tasks at once"""
-    # Create project
-    project_response = test_client.post("/api/v1/projects", json={
-        "title": "Bulk Test Project"
-    })
-    project_id = project_response.json()["id"]
-    
     # Create multiple tasks
     bulk_response = test_client.post("/api/v1/tasks/bulk", json={
         "tasks": [
@@ -188,6 +198,33 @@ def test_ai_tools_get_task_details(test_db):
     assert task_details["project"]["title"] == "AI Tools Test Project"
 
 
+def test_ai_tools_get_split_context(test_db):
+    """Test AI tools gather task, project and sibling tasks for splitting"""
+    db = test_db()
+    
+    project = Project(title="Split Context Project", location="garage")
+    db.add(project)
+    db.commit()
+    db.refresh(project)
+    
+    task = Task(project_id=project.id, title="Task to split")
+    done = Task(project_id=project.id, title="Finished task", is_completed=True)
+    db.add_all([task, done])
+    db.commit()
+    db.refresh(task)
+    
+    ai_tools = AITaskTools(db)
+    split_context = ai_tools.get_split_context(task.id)
+    
+    assert split_context["task"]["title"] == "Task to split"
+    assert split_context["task"]["project"]["title"] == "Split Context Project"
+    assert split_context["project"]["location"] == "garage"
+    assert split_context["project"]["task_stats"] == {"total": 2, "completed": 1, "pending": 1}
+    assert {t["title"] for t in split_context["project_tasks"]} == {"Task to split", "Finished task"}
+    assert split_context["project"] == ai_tools.get_project_context(project.id)
+    assert ai_tools.get_split_context(99999) is None
+
+
 def test_ai_tools_create_multiple_tasks(test_db):
     """Test AI tools can create multiple tasks"""
     db = test_db()
@@ -216,24 +253,58 @@ def test_ai_tools_create_multiple_tasks(test_db):
         }
     ]
     
-    created_tasks = ai_tools.create_multiple_tasks(tasks_data)
+    # Record the task INSERTs so a per-row insert regression is caught
+    inserts = []
     
+    def record_insert(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO tasks"):
+            inserts.append(statement)
+    
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", record_insert)
+    try:
+        created_tasks = ai_tools.create_multiple_tasks(tasks_data)
+    finally:
+        event.remove(engine, "before_cursor_execute", record_insert)
+    
+    assert len(inserts) == 1
     assert len(created_tasks) == 2
     assert created_tasks[0]["title"] == "AI Created Task 1"
     assert created_tasks[1]["priority"] == "high"
     assert created_tasks[1]["energy_level"] == "low"
 
 
-@patch('services.ai_service.httpx.AsyncClient')
-def test_task_split_with_mocked_ai(mock_client, test_client):
-    """Test task splitting with mocked AI response"""
-    # Create project and task
-    project_response = test_client.post("/api/v1/projects", json={
-        "title": "Split Test Project",
-        "description": "Project for testing task splitting"
-    })
-    project_id = project_response.json()["id"]
+def test_ai_tools_update_and_delete_task(test_db):
+    """Test AI tools update a task in place and delete it"""
+    db = test_db()
+    
+    project = Project(title="Update Delete Project")
+    db.add(project)
+    db.commit()
+    db.refresh(project)
     
+    task = Task(project_id=project.id, title="Original title")
+    db.add(task)
+    db.commit()
+    db.refresh(task)
+    
+    ai_tools = AITaskTools(db)
+    updated = ai_tools.update_task(task.id, {"title": "New title", "priority": "high", "unknown": 1})
+    
+    assert updated["id"] == task.id
+    assert updated["title"] == "New title"
+    assert updated["priority"] == "high"
+    assert ai_tools.get_task_details(task.id)["title"] == "New title"
+    assert ai_tools.update_task(99999, {"title": "Missing"}) is None
+    
+    assert ai_tools.delete_task(task.id) is True
+    assert ai_tools.delete_task(task.id) is False
+    assert ai_tools.get_task_details(task.id) is None
+
+
+def test_task_split_with_mocked_ai(test_client, project_id, ollama_generate):
+    """Test task splitting with mocked AI response"""
+    # Create a task
     task_response = test_client.post("/api/v1/tasks", json={
         "project_id": project_id,
         "title": "Complex Task to Split",
@@ -244,48 +315,13 @@ def test_task_split_with_mocked_ai(mock_client, test_client):
     task_id = task_response.json()["id"]
     
     # Mock AI response
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {
-        "response": '''[
-            {
-                "title": "Plan the complex task approach",
-                "description": "Spend time planning how to tackle the complex task",
-                "estimated_minutes": 15,
-                "energy_level": "medium",
-                "context": "when you need to get started",
-                "reasoning": "Planning reduces overwhelm"
-            },
-            {
-                "title": "Execute first phase of task",
-                "description": "Begin working on the first part of the complex task",
-                "estimated_minutes": 20,
-                "energy_level": "high",
-                "context": "when you have focus",
-                "reasoning": "Breaking into phases makes it manageable"
-            },
-            {
-                "title": "Complete and review task",
-                "description": "Finish the task and review the results",
-                "estimated_minutes": 25,
-                "energy_level": "medium",
-                "context": "anytime",
-                "reasoning": "Proper completion ensures quality"
-            }
-        ]'''
-    }
-    
-    # Configure mock client
-    mock_client_instance = AsyncMock()
-    mock_client_instance.__aenter__.return_value = mock_client_instance
-    mock_client_instance.post.return_value = mock_response
-    mock_client.return_value = mock_client_instance
+    ollama_generate.mock(return_value=httpx.Response(200, content=SPLIT_GENERATE_BODY))
     
     # Test task splitting
     split_response = test_client.post(f"/api/v1/tasks/{task_id}/split")
     assert split_response.status_code == 200
     
-    split_data = split_response.json()
+    split_data = loads_json(split_response.content)
     assert "original_task" in split_data
     assert "suggested_tasks" in split_data
     assert split_data["original_task"]["title"] == "Complex Task to Split"
@@ -293,14 +329,9 @@ def test_task_split_with_mocked_ai(mock_client, test_client):
     assert split_data["suggested_tasks"][0]["title"] == "Plan the complex task approach"
 
 
-def test_task_split_fallback(test_client):
+def test_task_split_fallback(test_client, project_id, ollama_generate):
     """Test task splitting falls back gracefully when AI is unavailable"""
-    # Create project and task
-    project_response = test_client.post("/api/v1/projects", json={
-        "title": "Fallback Test Project"
-    })
-    project_id = project_response.json()["id"]
-    
+    # Create a task
     task_response = test_client.post("/api/v1/tasks", json={
         "project_id": project_id,
         "title": "Task for Fallback Test",
@@ -309,37 +340,29 @@ def test_task_split_fallback(test_client):
     task_id = task_response.json()["id"]
     
     # Mock AI service to raise an exception (simulating AI unavailable)
-    with patch('services.ai_service.httpx.AsyncClient') as mock_client:
-        mock_client.side_effect = Exception("AI service unavailable")
-        
-        split_response = test_client.post(f"/api/v1/tasks/{task_id}/split")
-        assert split_response.status_code == 200
-        
-        split_data = split_response.json()
-        assert "suggested_tasks" in split_data
-        assert len(split_data["suggested_tasks"]) == 3  # Fallback provides 3 tasks
-        
-        # Check that fallback tasks are reasonable
-        suggested_tasks = split_data["suggested_tasks"]
-        assert "Plan approach" in suggested_tasks[0]["title"]
-        assert "Start work" in suggested_tasks[1]["title"]
-        assert "Complete and review" in suggested_tasks[2]["title"]
-
-
-def test_task_not_found_errors(test_client):
-    """Test appropriate error handling for non-existent tasks"""
-    # Test getting non-existent task
-    get_response = test_client.get("/api/v1/tasks/99999")
-    assert get_response.status_code == 404
+    ollama_generate.mock(side_effect=httpx.ConnectError("AI service unavailable"))
     
-    # Test updating non-existent task
-    update_response = test_client.put("/api/v1/tasks/99999", json={"title": "Updated"})
-    assert update_response.status_code == 404
+    split_response = test_client.post(f"/api/v1/tasks/{task_id}/split")
+    assert split_response.status_code == 200
     
-    # Test deleting non-existent task
-    delete_response = test_client.delete("/api/v1/tasks/99999")
-    assert delete_response.status_code == 404
+    split_data = loads_json(split_response.content)
+    assert "suggested_tasks" in split_data
+    assert len(split_data["suggested_tasks"]) == 3  # Fallback provides 3 tasks
     
-    # Test splitting non-existent task
-    split_response = test_client.post("/api/v1/tasks/99999/split")
-    assert split_response.status_code == 404 
\ No newline at end of file
+    # Check that fallback tasks are reasonable
+    suggested_tasks = split_data["suggested_tasks"]
+    assert "Plan approach" in suggested_tasks[0]["title"]
+    assert "Start work" in suggested_tasks[1]["title"]
+    assert "Complete and review" in suggested_tasks[2]["title"]
+
+
+@pytest.mark.parametrize("method,path,body", [
+    ("get", "/api/v1/tasks/99999", None),
+    ("put", "/api/v1/tasks/99999", {"title": "Updated"}),
+    ("delete", "/api/v1/tasks/99999", None),
+    ("post", "/api/v1/tasks/99999/split", None),
+], ids=["get", "update", "delete", "split"])
+def test_task_not_found_errors(test_client, method, path, body):
+    """Test appropriate error handling for non-existent tasks"""
+    response = getattr(test_client, method)(path, **({"json": body} if body else {}))
+    assert response.status_code == 404
@@ -2,12 +2,6 @@
 Simple database tests to verify models and basic database functionality
 """
 import pytest
-import sys
-from pathlib import Path
-
-# Add the backend directory to Python path
-backend_dir = Path(__file__).parent.parent
-sys.path.insert(0, str(backend_dir))
 
 def test_database_models_import():
     """Test that database models can be imported"""
@@ -2,21 +2,12 @@
 Alternative simple endpoint tests that bypass TestClient version issues
 """
 import pytest
-import sys
-from pathlib import Path
 
-# Add the backend directory to Python path
-backend_dir = Path(__file__).parent.parent
-sys.path.insert(0, str(backend_dir))
-
-def test_endpoints_exist():
+def test_endpoints_exist(route_paths):
     """Test that endpoints are properly registered"""
-    from main import app
-    
     # Check that routes are registered
-    routes = [route.path for route in app.routes]
-    assert "/" in routes
-    assert "/health" in routes
+    assert "/" in route_paths
+    assert "/health" in route_paths
     
 def test_app_configuration():
     """Test FastAPI app configuration"""
@@ -26,22 +17,12 @@ def test_app_configuration():
     assert app.description == "AI-guided project companion backend"
     assert app.version == "1.0.0"
 
-def test_middleware_configured():
+def test_middleware_configured(has_cors):
     """Test that CORS middleware is configured"""
-    from main import app
-    
-    # Check that middleware is added (look at middleware stack)
-    middleware_found = False
-    for middleware in app.user_middleware:
-        if hasattr(middleware, 'cls') and 'CORS' in str(middleware.cls):
-            middleware_found = True
-            break
-    assert middleware_found
+    assert has_cors
 
-def test_routers_included():
+def test_routers_included(route_paths):
     """Test that API routers are properly included"""
-    from main import app
-    
     # Check that API routes are registered
-    api_routes = [route.path for route in app.routes if route.path.startswith("/api")]
+    api_routes = [path for path in route_paths if path.startswith("/api")]
     assert len(api_routes) > 0 
\ No newline at end of file
@@ -0,0 +1,35 @@
+from services.gen_cache import GenCache, template_id
+
+
+SUGGESTIONS = [{
+    "title": "Sketch the garden shed layout",
+    "description": "Draw where the garden shed shelves should go",
+    "estimated_minutes": 10,
+}]
+
+
+class TestGenCache:
+    """Test suite for the structural prompt cache"""
+
+    def test_similar_slots_reuse_rewritten_response(self):
+        """Test a near-identical project gets the cached response with its own title"""
+        cache = GenCache()
+        skeleton = template_id("Project: {title}")
+        cache.store(skeleton, {"title": "garden shed"}, SUGGESTIONS)
+
+        result = cache.lookup(skeleton, {"title": "garden sheds"})
+
+        assert result is not None
+        assert result[0]["title"] == "Sketch the garden sheds layout"
+        assert result[0]["estimated_minutes"] == 10
+        assert SUGGESTIONS[0]["title"] == "Sketch the garden shed layout"
+
+    def test_dissimilar_slots_or_skeletons_miss(self):
+        """Test unrelated projects and different skeletons are not reused"""
+        cache = GenCache()
+        skeleton = template_id("Project: {title}")
+        cache.store(skeleton, {"title": "garden shed"}, SUGGESTIONS)
+
+        assert cache.lookup(skeleton, {"title": "write novel"}) is None
+        assert cache.lookup(template_id("Project: {title}\nLocation: {location}"),
+                            {"title": "garden shed", "location": "yard"}) is None
@@ -3,12 +3,6 @@ Integration tests that require database setup
 These tests use the test database fixtures from conftest.py
 """
 import pytest
-import sys
-from pathlib import Path
-
-# Add the backend directory to Python path
-backend_dir = Path(__file__).parent.parent
-sys.path.insert(0, str(backend_dir))
 
 def test_create_project_with_db(test_client):
     """Test project creation with database"""
@@ -3,31 +3,25 @@ Simple integration tests that test database functionality without TestClient
 These tests focus on testing the business logic with database operations
 """
 import pytest
-import sys
-from pathlib import Path
 
-# Add the backend directory to Python path
-backend_dir = Path(__file__).parent.parent
-sys.path.insert(0, str(backend_dir))
-
-def test_database_tables_creation():
+def test_database_tables_creation(db_session):
     """Test that database tables can be created"""
     try:
-        from database import engine, Base
-        # This should work without errors
-        Base.metadata.create_all(bind=engine)
-        assert True
+        from sqlalchemy import inspect
+        from database import Base
+        # The session-wide test schema is built once by create_all in conftest
+        table_names = inspect(db_session.connection()).get_table_names()
+        assert set(Base.metadata.tables) <= set(table_names)
     except Exception as e:
         pytest.fail(f"Database table creation failed: {e}")
 
-def test_project_model_database_operations():
+def test_project_model_database_operations(db_session):
     """Test basic project model database operations"""
     try:
-        from database import SessionLocal
         from models.project import Project
         
-        # Create a session
-        db = SessionLocal()
+        # The session's transaction is rolled back after the test
+        db = db_session
         
         # Create a test project
         test_project = Project(
@@ -47,27 +41,18 @@ def test_project_model_database_operations():
         assert test_project.title == "Integration Test Project"
         
         # Query it back
-        retrieved_project = db.query(Project).filter(Project.id == test_project.id).first()
+        retrieved_project = db.get(Project, test_project.id)
         assert retrieved_project is not None
         assert retrieved_project.title == "Integration Test Project"
         
-        # Clean up
-        db.delete(test_project)
-        db.commit()
-        db.close()
-        
     except Exception as e:
         pytest.fail(f"Database operations failed: {e}")
 
-def test_api_routes_registration():
+def test_api_routes_registration(route_paths):
     """Test that API routes are properly registered"""
     try:
-        from main import app
         from api import projects, tasks, activity, suggestions
         
-        # Check that routes exist in the app
-        route_paths = [route.path for route in app.routes]
-        
         # Should have basic routes
         assert "/" in route_paths
         assert "/health" in route_paths
@@ -2,102 +2,63 @@
 Live API tests that work with the running development server
 These tests require the API to be running at localhost:8010
 """
+import asyncio
 import pytest
 import httpx
-import sys
-from pathlib import Path
 
-# Add the backend directory to Python path
-backend_dir = Path(__file__).parent.parent
-sys.path.insert(0, str(backend_dir))
+@pytest.mark.asyncio
+async def test_api_probes(live_api):
+    """Test health, root, docs and OpenAPI endpoints respond on the live API"""
+    async with httpx.AsyncClient(base_url=live_api) as client:
+        health, root, docs, schema = await asyncio.gather(
+            client.get("/health"),
+            client.get("/"),
+            client.get("/docs"),
+            client.get("/openapi.json"),
+        )
+    
+    # The API is available and responding
+    assert health.status_code == 200
+    assert health.json()["status"] == "healthy"
+    
+    # Root endpoint
+    assert root.status_code == 200
+    data = root.json()
+    assert data["message"] == "Motivate.AI Backend API"
+    assert data["version"] == "1.0.0"
+    
+    # API documentation should return HTML content
+    assert docs.status_code == 200
+    assert "text/html" in docs.headers.get("content-type", "")
+    
+    # OpenAPI schema
+    assert schema.status_code == 200
+    data = schema.json()
+    assert "openapi" in data
+    assert data["info"]["title"] == "Motivate.AI API"
 
-@pytest.fixture
-def api_client():
-    """Create an HTTP client for the live API"""
-    return httpx.Client(base_url="http://localhost:8010")
-
-def test_api_available(api_client):
-    """Test that the API is available and responding"""
-    try:
-        response = api_client.get("/health")
-        assert response.status_code == 200
-        data = response.json()
-        assert data["status"] == "healthy"
-    except httpx.ConnectError:
-        pytest.skip("API not running at localhost:8010")
-
-def test_root_endpoint_live(api_client):
-    """Test the root endpoint on live API"""
-    try:
-        response = api_client.get("/")
-        assert response.status_code == 200
-        data = response.json()
-        assert data["message"] == "Motivate.AI Backend API"
-        assert data["version"] == "1.0.0"
-    except httpx.ConnectError:
-        pytest.skip("API not running at localhost:8010")
-
-def test_api_docs_available(api_client):
-    """Test that API documentation is available"""
-    try:
-        response = api_client.get("/docs")
-        assert response.status_code == 200
-        # Should return HTML content
-        assert "text/html" in response.headers.get("content-type", "")
-    except httpx.ConnectError:
-        pytest.skip("API not running at localhost:8010")
-
-def test_openapi_schema(api_client):
-    """Test that OpenAPI schema is available"""
-    try:
-        response = api_client.get("/openapi.json")
-        assert response.status_code == 200
-        data = response.json()
-        assert "openapi" in data
-        assert data["info"]["title"] == "Motivate.AI API"
-    except httpx.ConnectError:
-        pytest.skip("API not running at localhost:8010")
-
-def test_cors_configured():
+def test_cors_configured(has_cors):
     """Test that CORS is properly configured in the application"""
-    try:
-        # Test that CORS middleware is configured by checking app structure
-        from main import app
-        
-        # Check that CORSMiddleware is in the middleware stack
-        middleware_found = False
-        for middleware in app.user_middleware:
-            if hasattr(middleware, 'cls') and 'CORS' in str(middleware.cls):
-                middleware_found = True
-                break
-        
-        assert middleware_found, "CORS middleware not found in app configuration"
-        
-    except ImportError:
-        pytest.skip("Cannot import main app")
+    assert has_cors, "CORS middleware not found in app configuration"
 
 def test_create_project_live(api_client):
     """Test project creation on live API"""
-    try:
-        project_data = {
-            "title": "Live Test Project",
-            "description": "Testing with live API",
-            "priority": "medium"
-        }
-        
-        response = api_client.post("/api/v1/projects", json=project_data)
-        
-        # Check if it's a database error (500) or success
-        if response.status_code == 500:
-            # Skip if database not properly initialized
-            pytest.skip("Database not properly initialized - projects endpoint returns 500")
-        else:
-            assert response.status_code == 200
-            data = response.json()
-            assert data["title"] == project_data["title"]
-            assert data["description"] == project_data["description"]
-            assert "id" in data
-            assert "created_at" in data
-        
-    except httpx.ConnectError:
-        pytest.skip("API not running at localhost:8010") 
\ No newline at end of file
+    project_data = {
+        "title": "Live Test Project",
+        "description": "Testing with live API",
+        "priority": "medium"
+    }
+    
+    response = api_client.post("/api/v1/projects", json=project_data)
+    
+    # Check if it's a database error (500) or success
+    if response.status_code == 500:
+        # Skip if database not properly initialized
+        pytest.skip("Database not properly initialized - projects endpoint returns 500")
+    else:
+        assert response.status_code == 200
+        data = response.json()
+        assert data["title"] == project_data["title"]
+        assert data["description"] == project_data["description"]
+        assert "id" in data
+        assert "created_at" in data
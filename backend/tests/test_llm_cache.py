@@ -0,0 +1,46 @@
+import pytest
+
+from services.llm_cache import LLMCache
+from services.ollama_utils import request_key
+
+
+class TestLLMCache:
+    """Test suite for the LLM response cache"""
+
+    @pytest.mark.asyncio
+    async def test_hit_and_miss_are_counted(self):
+        """Test cached values are returned and stats track lookups"""
+        cache = LLMCache()
+        assert await cache.get("missing") is None
+
+        await cache.set("key", [{"title": "Cached"}])
+        assert await cache.get("key") == [{"title": "Cached"}]
+        assert cache.stats == {"hits": 1, "misses": 1}
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_are_dropped(self):
+        """Test entries past their TTL are treated as misses"""
+        cache = LLMCache()
+        await cache.set("key", ["value"], ttl=0)
+
+        assert await cache.get("key") is None
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_entry_is_evicted(self):
+        """Test the cache stays within max_entries using LRU order"""
+        cache = LLMCache(max_entries=2)
+        await cache.set("a", 1)
+        await cache.set("b", 2)
+        await cache.get("a")
+        await cache.set("c", 3)
+
+        assert await cache.get("b") is None
+        assert await cache.get("a") == 1
+        assert await cache.get("c") == 3
+
+    def test_request_key_depends_on_options(self):
+        """Test the key changes with sampling options but not dict order"""
+        key = request_key("model", "prompt", {"temperature": 0.7, "top_p": 0.9})
+        assert key == request_key("model", "prompt", {"top_p": 0.9, "temperature": 0.7})
+        assert key != request_key("model", "prompt", {"temperature": 0.1, "top_p": 0.9})
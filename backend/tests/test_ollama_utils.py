@@ -0,0 +1,39 @@
+import json
+import pytest
+
+from services.ollama_utils import JSONArrayStream, extract_json_array, extract_response_text
+
+
+def test_extract_response_text_skips_wrapper():
+    """Test only the response field is decoded from a generate body"""
+    body = json.dumps({
+        "model": "qwen3max:latest",
+        "response": '[{"title": "Café \\"break\\""}]',
+        "done": True,
+        "context": list(range(50))
+    }).encode()
+
+    assert extract_response_text(body) == '[{"title": "Café \\"break\\""}]'
+    assert extract_response_text(b'{"done": true}') == ""
+
+
+def test_extract_json_array_ignores_think_and_fences():
+    """Test the array is decoded past think blocks, fences and trailing text"""
+    text = '<think>try [1]?</think>\n```json\n[{"title": "A]"}]\n```\nDone.'
+    assert extract_json_array(text) == [{"title": "A]"}]
+
+    with pytest.raises(json.JSONDecodeError):
+        extract_json_array('{"title": "not a list"}')
+
+
+def test_json_array_stream_yields_items_as_they_close():
+    """Test streamed text yields each array element once it is complete"""
+    parser = JSONArrayStream()
+    text = '<think>maybe [1]</think>```json\n[{"title": "A}"}, {"title": "B"}]\n```'
+
+    items = []
+    for i in range(0, len(text), 4):
+        items.extend(parser.feed(text[i:i + 4]))
+
+    assert items == [{"title": "A}"}, {"title": "B"}]
+    assert parser.done
@@ -9,13 +9,14 @@ import winshell
 from win32com.client import Dispatch
 from pathlib import Path
 
+HERE = Path(__file__).resolve().parent
+
 def create_shortcut():
     """Create a desktop shortcut for Motivate.AI"""
     
     # Get paths
     desktop_dir = Path.home() / "Desktop"
-    current_dir = Path(__file__).parent.absolute()
-    batch_file = current_dir / "start_desktop.bat"
+    batch_file = HERE / "start_desktop.bat"
     
     # Shortcut details
     shortcut_name = "Motivate.AI Desktop App.lnk"
@@ -25,7 +26,7 @@ def create_shortcut():
     shell = Dispatch('WScript.Shell')
     shortcut = shell.CreateShortCut(str(shortcut_path))
     shortcut.Targetpath = str(batch_file)
-    shortcut.WorkingDirectory = str(current_dir)
+    shortcut.WorkingDirectory = str(HERE)
     shortcut.IconLocation = str(batch_file)
     shortcut.Description = "Motivate.AI - AI-Guided Project Companion"
     shortcut.save()
@@ -46,8 +47,8 @@ if __name__ == "__main__":
         print(f"\n📋 Manual shortcut creation:")
         print(f"   1. Right-click on your desktop")
         print(f"   2. Select 'New' → 'Shortcut'")
-        print(f"   3. Browse to: {Path(__file__).parent.absolute() / 'start_desktop.bat'}")
+        print(f"   3. Browse to: {HERE / 'start_desktop.bat'}")
         print(f"   4. Name it: 'Motivate.AI Desktop App'")
     except Exception as e:
         print(f"❌ Error creating shortcut: {e}")
-        print(f"\n📁 You can manually run: {Path(__file__).parent.absolute() / 'start_desktop.bat'}") 
\ No newline at end of file
+        print(f"\n📁 You can manually run: {HERE / 'start_desktop.bat'}") 
\ No newline at end of file
@@ -5,21 +5,43 @@ This script demonstrates the new AI task splitting capabilities.
 Run this after starting the backend to see the AI assistant in action!
 """
 
-import requests
+import asyncio
+import httpx
 import json
 from typing import Dict, List
 
-def demo_ai_features():
+API_BASE_URL = "http://127.0.0.1:8010/api/v1"
+
+def create_client() -> httpx.AsyncClient:
+    """Create one pooled async client for every call the demo makes"""
+    # Retry failed connection attempts, like the desktop app's shared session
+    transport = httpx.AsyncHTTPTransport(
+        retries=2,
+        # Small keep-alive pool: the demo only ever talks to one local host
+        limits=httpx.Limits(max_keepalive_connections=4, max_connections=8),
+    )
+    return httpx.AsyncClient(base_url=API_BASE_URL, timeout=httpx.Timeout(300), transport=transport)
+
+async def demo_ai_features(client: httpx.AsyncClient):
     """Demonstrate the AI features"""
-    api_base_url = "http://127.0.0.1:8010/api/v1"
-    
     print("🤖 Motivate.AI - AI Task Splitting Demo")
     print("=" * 50)
     
+    # The status, operations and projects lookups are independent, so fetch
+    # them concurrently; exceptions are returned and reported per section
+    status_response, operations_response, projects_response = await asyncio.gather(
+        client.get("/ai-agent/status"),
+        client.get("/ai-agent/operations"),
+        client.get("/projects", timeout=5),
+        return_exceptions=True
+    )
+    
     # Check AI status
     print("\n1. Checking AI Agent Status...")
     try:
-        response = requests.get(f"{api_base_url}/ai-agent/status", timeout=300)
+        response = status_response
+        if isinstance(response, Exception):
+            raise response
         if response.status_code == 200:
             status = response.json()
             print(f"   ✅ AI Agent: {status['status'].upper()}")
@@ -35,7 +57,9 @@ def demo_ai_features():
     # Get available operations
     print("\n2. Available AI Operations...")
     try:
-        response = requests.get(f"{api_base_url}/ai-agent/operations", timeout=300)
+        response = operations_response
+        if isinstance(response, Exception):
+            raise response
         if response.status_code == 200:
             operations = response.json()
             for op in operations['supported_operations']:
@@ -48,7 +72,9 @@ def demo_ai_features():
     # Check for projects
     print("\n3. Checking for Projects...")
     try:
-        response = requests.get(f"{api_base_url}/projects", timeout=5)
+        response = projects_response
+        if isinstance(response, Exception):
+            raise response
         if response.status_code == 200:
             projects = response.json()
             if projects:
@@ -56,19 +82,18 @@ def demo_ai_features():
                 print(f"   📋 Found project: {project['title']}")
                 
                 # Check for complex tasks
-                response = requests.get(f"{api_base_url}/tasks?project_id={project['id']}", timeout=5)
+                response = await client.get("/tasks", params={"project_id": project["id"]}, timeout=5)
                 if response.status_code == 200:
                     tasks = response.json()
-                    complex_tasks = [task for task in tasks 
-                                   if task.get('estimated_minutes', 0) > 30 or len(task.get('title', '')) > 50]
+                    task = next((task for task in tasks
+                                 if task.get('estimated_minutes', 0) > 30 or len(task.get('title', '')) > 50), None)
                     
-                    if complex_tasks:
-                        task = complex_tasks[0]
+                    if task:
                         print(f"   🎯 Found complex task: {task['title']}")
                         print(f"   ⏱️ Estimated time: {task.get('estimated_minutes', 15)} minutes")
                         
                         # Demo AI split
-                        demo_task_split(api_base_url, task)
+                        await demo_task_split(client, task)
                     else:
                         print("   ℹ️ No complex tasks found (create tasks > 30 min to see AI splitting)")
                 else:
@@ -80,7 +105,7 @@ def demo_ai_features():
     except Exception as e:
         print(f"   ❌ Error: {e}")
 
-def demo_task_split(api_base_url: str, task: Dict):
+async def demo_task_split(client: httpx.AsyncClient, task: Dict):
     """Demonstrate AI task splitting"""
     print(f"\n4. AI Task Splitting Demo...")
     print(f"   🔍 Analyzing task: {task['title']}")
@@ -97,8 +122,7 @@ def demo_task_split(api_base_url: str, task: Dict):
     
     try:
         print("   🧠 Sending to AI for analysis...")
-        response = requests.post(f"{api_base_url}/ai-agent/preview", 
-                               json=request_data, timeout=600)
+        response = await client.post("/ai-agent/preview", json=request_data, timeout=600)
         
         if response.status_code == 200:
             preview = response.json()
@@ -120,7 +144,7 @@ def demo_task_split(api_base_url: str, task: Dict):
                     print(f"         💡 {subtask.get('context', 'anytime')}")
                 
                 # Show reasoning
-                reasoning = preview.get('reasoning', '').replace('\n', ' ')[:200]
+                reasoning = preview.get('reasoning', '')[:200].replace('\n', ' ')
                 print(f"\n   🧠 AI Reasoning: {reasoning}...")
                 
                 print(f"\n   💡 In the desktop app, you would now see a beautiful dialog")
@@ -139,12 +163,12 @@ def demo_task_split(api_base_url: str, task: Dict):
                 except:
                     print(f"      Response: {response.text[:100]}")
                     
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         print("   ⏰ AI Analysis timed out (this is normal if AI model is starting up)")
     except Exception as e:
         print(f"   ❌ Error: {e}")
 
-def create_demo_data(api_base_url: str):
+async def create_demo_data(client: httpx.AsyncClient):
     """Create demo project and complex task for testing"""
     print("\n🎯 Creating Demo Data...")
     
@@ -156,7 +180,7 @@ def create_demo_data(api_base_url: str):
     }
     
     try:
-        response = requests.post(f"{api_base_url}/projects", json=project_data, timeout=5)
+        response = await client.post("/projects", json=project_data, timeout=5)
         if response.status_code == 200:
             project = response.json()
             print(f"   ✅ Created project: {project['title']}")
@@ -172,7 +196,7 @@ def create_demo_data(api_base_url: str):
                 "context": "when you have deep focus time and minimal interruptions"
             }
             
-            response = requests.post(f"{api_base_url}/tasks", json=task_data, timeout=5)
+            response = await client.post("/tasks", json=task_data, timeout=5)
             if response.status_code == 201:
                 task = response.json()
                 print(f"   ✅ Created complex task: {task['title'][:50]}...")
@@ -188,6 +212,20 @@ def create_demo_data(api_base_url: str):
     
     return None, None
 
+async def main(create_data: bool):
+    """Run the demo with one client shared by every request"""
+    async with create_client() as client:
+        if create_data:
+            project, task = await create_demo_data(client)
+            if project and task:
+                print(f"\n🎉 Demo data created! Now run the desktop app and:")
+                print(f"   1. Select the '{project['title']}' project")
+                print(f"   2. Look for the task with the 🤖 Auto Split button")
+                print(f"   3. Click it to see the AI in action!")
+        
+        # Run main demo
+        await demo_ai_features(client)
+
 if __name__ == "__main__":
     print("Starting AI Features Demo...")
     print("Make sure the backend is running on http://127.0.0.1:8010")
@@ -195,17 +233,7 @@ if __name__ == "__main__":
     
     # Option to create demo data
     response = input("Create demo data for testing? (y/n): ").lower().strip()
-    if response == 'y':
-        api_base_url = "http://127.0.0.1:8010/api/v1"
-        project, task = create_demo_data(api_base_url)
-        if project and task:
-            print(f"\n🎉 Demo data created! Now run the desktop app and:")
-            print(f"   1. Select the '{project['title']}' project")
-            print(f"   2. Look for the task with the 🤖 Auto Split button")
-            print(f"   3. Click it to see the AI in action!")
-    
-    # Run main demo
-    demo_ai_features()
+    asyncio.run(main(response == 'y'))
     
     print("\n🎉 Demo complete!")
     print("💡 To see the full AI experience, run the desktop app and try splitting tasks!") 
\ No newline at end of file
@@ -17,8 +17,15 @@ def main():
     print("🚀 Starting Motivate.AI Desktop App...")
     
     try:
-        # Import and run the main window directly
-        from ui.main_window import MainWindow
+        # Import and run the main window directly; deferred to here so that
+        # importing this module doesn't pull in the Tk/CustomTkinter stack
+        try:
+            from ui.main_window import MainWindow
+        except ImportError as e:
+            print(f"❌ Missing dependency: {e.name or e}")
+            print("   Install the desktop requirements with: pip install -r requirements.txt")
+            input("\nPress Enter to close...")
+            return
         
         print("✅ Creating main window...")
         app = MainWindow()
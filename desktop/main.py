@@ -7,10 +7,17 @@ idle monitoring, and speech recognition into a complete desktop experience.
 
 import os
 import sys
+import logging
+import queue
 import time
 import threading
 import signal
+import traceback
+from dataclasses import dataclass
 from pathlib import Path
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
 
 # Add the desktop directory to the Python path
 desktop_dir = Path(__file__).parent
@@ -28,20 +35,65 @@ from ui.quick_add import show_quick_add
 # Services
 from services.tray_manager_fixed import get_tray_manager
 from services.idle_monitor import get_smart_idle_manager
+from services.http import SESSION
 
 # Load environment variables
 load_dotenv()
 
+
+@dataclass(frozen=True)
+class Config:
+    """Settings read from the environment once, at import"""
+    api_base_url: str
+    idle_threshold: int  # minutes
+    health_url: str
+
+
+def load_config() -> Config:
+    """Build the app config; a malformed value fails here rather than mid-run"""
+    api_base_url = os.getenv("API_BASE_URL", "http://127.0.0.1:8010/api/v1")
+    # /health sits at the server root, whatever path the API is mounted under
+    base = urlsplit(api_base_url)
+    return Config(
+        api_base_url=api_base_url,
+        idle_threshold=int(os.getenv("IDLE_THRESHOLD_MINUTES", "10")),
+        health_url=urlunsplit((base.scheme, base.netloc, "/health", "", "")),
+    )
+
+
+CONFIG = load_config()
+
+# How long a backend health check result is reused, in seconds
+_BACKEND_STATUS_TTL = 30
+# Most tray actions handled per tick; the rest wait for the next tick
+_MAX_TRAY_ACTIONS_PER_TICK = 32
+
+# Runtime messages are queued from the Tk thread and written to the console
+# by a QueueListener thread, so logging never blocks the event loop on I/O
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+log = logging.getLogger("motivate_ai")
+log.setLevel(logging.INFO)
+log.addHandler(QueueHandler(_log_queue))
+log.propagate = False
+
+
+def start_logging() -> QueueListener:
+    """Start writing queued log records to the console"""
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter("%(message)s"))
+    listener = QueueListener(_log_queue, console)
+    listener.start()
+    return listener
+
+
 class MotivateAIApp:
     """Main application class that coordinates all components"""
     
     def __init__(self):
-        self.api_base_url = os.getenv("API_BASE_URL", "http://127.0.0.1:8010/api/v1")
-        self.idle_threshold = int(os.getenv("IDLE_THRESHOLD_MINUTES", "10"))
-        
         # Application state
         self.running = False
         self.main_window = None
+        self._mw_alive = False  # Main window's Tk root exists (cleared on <Destroy>)
         self.tray_manager = None
         self.popup_manager = None
         self.idle_manager = None
@@ -49,29 +101,51 @@ class MotivateAIApp:
         # Threads
         self.tray_thread = None
         
-        print("🚀 Initializing Motivate.AI Desktop App...")
+        # Shared HTTP session so backend calls reuse one kept-alive connection
+        self.http = SESSION
+        # (checked_at, reachable) from the last backend health check
+        self._backend_status: Optional[Tuple[float, bool]] = None
+        
+        # Tk event loop scheduling
+        self.tick_interval_ms = 50  # How often tray actions are polled
+        self.status_interval = 300  # Show status every 5 minutes
+        
+        log.info("🚀 Initializing Motivate.AI Desktop App...")
         
     def initialize_components(self):
         """Initialize all application components"""
         
         # Initialize popup manager first (needed by other components)
         self.popup_manager = get_popup_manager()
-        print("✅ Pop-up manager initialized")
+        log.info("✅ Pop-up manager initialized")
         
         # Initialize idle monitoring with popup integration (temporarily disabled for stability)
         # self.idle_manager = get_smart_idle_manager(self.popup_manager)
         self.idle_manager = None
-        print(f"⚠️ Idle monitoring temporarily disabled for stability")
+        log.info(f"⚠️ Idle monitoring temporarily disabled for stability")
         
-        # PRE-CREATE the main window on main thread (but keep it hidden)
-        print("🔄 Creating main window on main thread...")
-        self.main_window = MainWindow()
+        # Create the main window's Tk root on the main thread (kept hidden).
+        # The root must exist up front: it drives the event loop and owns the
+        # fonts, but its widgets aren't built until the window is first shown
+        log.info("🔄 Creating main window root on main thread...")
+        self.main_window = MainWindow(lazy=True)
+        self._track_main_window()
         self.main_window.root.withdraw()  # Hide it initially
-        print("✅ Main window pre-created and hidden")
+        # Its root drives the app's event loop, so closing it only hides it
+        self.main_window.root.protocol("WM_DELETE_WINDOW", self.main_window.root.withdraw)
+        log.info("✅ Main window root created; UI builds on first open")
         
         # Initialize tray manager (will create main window when needed)
         self.tray_manager = get_tray_manager()
-        print("✅ System tray manager initialized")
+        log.info("✅ System tray manager initialized")
+        
+        # Tray action name -> main-thread handler
+        self._action_handlers = {
+            "show_main_window": self.show_main_window_safe,
+            "quick_add_task": self.quick_add_task_safe,
+            "show_settings": self.show_settings_safe,
+            "quit_application": self.quit_application_safe,
+        }
         
         # Set up cross-component communication
         self.setup_integrations()
@@ -80,14 +154,14 @@ class MotivateAIApp:
         """Set up communication between components"""
         # Queue-based communication is now handled automatically
         # No need to override tray manager methods
-        print("✅ Component integrations configured")
+        log.info("✅ Component integrations configured")
     
     def on_task_added(self, task_data):
         """Handle when a new task is added"""
-        print(f"📝 New task added: {task_data['title']}")
+        log.info(f"📝 New task added: {task_data['title']}")
         
         # Refresh main window if open
-        if self.main_window:
+        if self.main_window and self.main_window.ui_built:
             self.main_window.load_tasks_list()
             self.main_window.load_projects_list()  # Refresh project pane with updated statistics
         
@@ -99,13 +173,27 @@ class MotivateAIApp:
             )
     
     def check_backend_connection(self) -> bool:
-        """Test if the backend API is running"""
+        """Test if the backend API is running, reusing a recent result"""
+        now = time.monotonic()
+        if self._backend_status and now - self._backend_status[0] < _BACKEND_STATUS_TTL:
+            return self._backend_status[1]
+        
+        self._backend_status = (now, self._probe_backend())
+        return self._backend_status[1]
+    
+    def _probe_backend(self) -> bool:
         try:
-            health_url = self.api_base_url.replace('/api/v1', '/health')
-            response = requests.get(health_url, timeout=5)
+            # Short timeouts: a local backend answers at once or isn't running
+            response = self.http.get(CONFIG.health_url, timeout=(0.5, 1.0))
             return response.status_code == 200
-        except Exception as e:
-            print(f"Backend connection failed: {e}")
+        except requests.Timeout:
+            log.warning("Backend connection timed out")
+            return False
+        except requests.ConnectionError as e:
+            log.warning(f"Backend connection failed: {e}")
+            return False
+        except requests.RequestException as e:
+            log.warning(f"Backend health check failed: {e}")
             return False
     
     def start(self):
@@ -113,8 +201,8 @@ class MotivateAIApp:
         print("\n" + "="*50)
         print("🌟 MOTIVATE.AI DESKTOP APP")
         print("="*50)
-        print(f"API URL: {self.api_base_url}")
-        print(f"Idle threshold: {self.idle_threshold} minutes")
+        print(f"API URL: {CONFIG.api_base_url}")
+        print(f"Idle threshold: {CONFIG.idle_threshold} minutes")
         print()
         
         # Check backend connection
@@ -137,7 +225,7 @@ class MotivateAIApp:
         print("🎯 Application started successfully!")
         print("\nRunning services:")
         print("  • System tray with context menu")
-        print("  • Pre-created main window (hidden)")
+        print("  • Main window (built on first open)")
         print("  • Smart pop-up notifications")
         print("  • Voice input support (coming soon)")
         print("\nTray menu options:")
@@ -165,124 +253,139 @@ class MotivateAIApp:
         
         # Start system tray (in background thread)
         self.tray_thread = self.tray_manager.start()
-        print("🔄 System tray started")
+        log.info("🔄 System tray started")
         
         # Start idle monitoring (temporarily disabled)
         # if self.idle_manager:
         #     self.idle_manager.start()
         #     print("🔄 Idle monitoring started")
-        print("⚠️ Idle monitoring disabled for stability")
+        log.info("⚠️ Idle monitoring disabled for stability")
         
         # Give services time to initialize
         time.sleep(1)
     
     def main_loop(self):
-        """Main application event loop"""
+        """Main application event loop, driven by Tk's own scheduler"""
+        root = self.main_window.root
         try:
-            last_status_time = 0
-            status_interval = 300  # Show status every 5 minutes
-            
-            while self.running:
-                current_time = time.time()
-                
-                # Process any pending tray actions (thread-safe)
-                self.process_tray_actions()
-                
-                # Update main window if it exists
-                if self.main_window and self.main_window.root.winfo_exists():
-                    try:
-                        self.main_window.root.update()
-                        # Process any pending updates
-                        self.main_window.process_pending_updates()
-                    except:
-                        pass  # Window might be destroyed
-                
-                # Show periodic status
-                if current_time - last_status_time > status_interval:
-                    self.show_status()
-                    last_status_time = current_time
-                
-                # Check if tray thread is still running and try to restart it
-                if self.tray_thread and not self.tray_thread.is_alive():
-                    print("⚠️  System tray thread stopped, attempting restart...")
-                    # Try to restart the tray once
-                    try:
-                        self.tray_thread = self.tray_manager._start_tray()
-                        if self.tray_thread:
-                            print("✅ System tray restarted")
-                        else:
-                            print("❌ Failed to restart tray, continuing without it...")
-                            self.tray_thread = None
-                    except Exception as e:
-                        print(f"❌ Failed to restart tray: {e}")
-                        print("🔄 Continuing without system tray...")
-                        self.tray_thread = None
-                
-                time.sleep(0.05)  # Further reduced sleep for better responsiveness
-                
+            root.after(0, self._tick)
+            root.after(0, self._status_tick)
+            # Tk sleeps on the OS event queue between callbacks instead of
+            # polling from Python
+            root.mainloop()
         except KeyboardInterrupt:
-            print("\n🛑 Shutdown requested by user")
+            log.info("🛑 Shutdown requested by user")
         except Exception as e:
-            print(f"\n💥 Unexpected error in main loop: {e}")
+            log.error(f"💥 Unexpected error in main loop: {e}")
         finally:
             self.shutdown()
     
+    def _tick(self):
+        """Poll the tray for work; reschedules itself until the app stops"""
+        root = self.main_window.root
+        if not self.running:
+            root.quit()
+            return
+        
+        # Process any pending tray actions (thread-safe)
+        self.process_tray_actions()
+        
+        # Hand updates queued by background threads to Tk's idle loop; only
+        # one drain is ever queued, so ticks don't re-enter it
+        try:
+            self.main_window.schedule_pending_updates()
+        except Exception:
+            pass  # Window might be destroyed
+        
+        self._restart_tray_if_dead()
+        root.after(self.tick_interval_ms, self._tick)
+    
+    def _status_tick(self):
+        """Show periodic status"""
+        if not self.running:
+            return
+        self.show_status()
+        self.main_window.root.after(self.status_interval * 1000, self._status_tick)
+    
+    def _restart_tray_if_dead(self):
+        """Check if tray thread is still running and try to restart it"""
+        if self.tray_thread and not self.tray_thread.is_alive():
+            log.warning("⚠️  System tray thread stopped, attempting restart...")
+            # Try to restart the tray once
+            try:
+                self.tray_thread = self.tray_manager._start_tray()
+                if self.tray_thread:
+                    log.info("✅ System tray restarted")
+                else:
+                    log.error("❌ Failed to restart tray, continuing without it...")
+                    self.tray_thread = None
+            except Exception as e:
+                log.error(f"❌ Failed to restart tray: {e}")
+                log.info("🔄 Continuing without system tray...")
+                self.tray_thread = None
+    
     def process_tray_actions(self):
         """Process pending actions from the tray manager (runs on main thread)"""
         if not self.tray_manager:
             return
             
-        actions = self.tray_manager.get_pending_actions()
+        actions = self.tray_manager.get_pending_actions(_MAX_TRAY_ACTIONS_PER_TICK)
         for action, params in actions:
             try:
-                if action == "show_main_window":
-                    self.show_main_window_safe()
-                elif action == "quick_add_task":
-                    self.quick_add_task_safe()
-                elif action == "show_settings":
-                    self.show_settings_safe()
-                elif action == "quit_application":
-                    self.quit_application_safe()
+                handler = self._action_handlers.get(action)
+                if handler:
+                    handler()
                 else:
-                    print(f"Unknown action: {action}")
+                    log.warning(f"Unknown action: {action}")
             except Exception as e:
-                print(f"Error processing action {action}: {e}")
+                log.error(f"Error processing action {action}: {e}")
     
     def show_main_window_safe(self):
         """Safely show main window on main thread"""
         try:
-            print("📱 Opening main window...")
+            log.info("📱 Opening main window...")
             
-            if not self.main_window or not self.main_window.root.winfo_exists():
-                print("🔄 Main window doesn't exist, creating new one...")
+            if not self._mw_alive:
+                log.info("🔄 Main window doesn't exist, creating new one...")
                 self.main_window = MainWindow()
-                print("✅ Main window created")
+                self._track_main_window()
+                log.info("✅ Main window created")
             
             # Show window and process any pending updates
             self.main_window.show_window()
-            print("✅ Main window opened")
+            log.info("✅ Main window opened")
             
         except Exception as e:
-            print(f"❌ Error opening main window: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception(f"❌ Error opening main window: {e}")
+    
+    def _track_main_window(self):
+        """Keep _mw_alive in step with the main window's root"""
+        root = self.main_window.root
+        self._mw_alive = True
+        
+        def on_destroy(event):
+            # <Destroy> also fires for every child widget; only the root counts
+            if event.widget is root:
+                self._mw_alive = False
+        
+        root.bind("<Destroy>", on_destroy, add="+")
     
     def quick_add_task_safe(self):
         """Safely show quick add dialog on main thread"""
         try:
-            print("➕ Opening quick add dialog...")
+            log.info("➕ Opening quick add dialog...")
             show_quick_add(on_task_added=self.on_task_added)
         except Exception as e:
-            print(f"❌ Error opening quick add: {e}")
+            log.error(f"❌ Error opening quick add: {e}")
     
     def show_settings_safe(self):
         """Safely show settings dialog on main thread"""
-        print("⚙️ Settings - Coming soon!")
+        log.info("⚙️ Settings - Coming soon!")
         # Future: implement settings dialog
     
     def quit_application_safe(self):
         """Safely quit application on main thread"""
-        print("🛑 Quitting application...")
+        log.info("🛑 Quitting application...")
         self.running = False
 
     def show_status(self):
@@ -293,7 +396,7 @@ class MotivateAIApp:
             is_idle = status.get('is_idle', False)
             
             status_icon = "😴" if is_idle else "🏃"
-            print(f"{status_icon} Status: {time.strftime('%H:%M:%S')} - "
+            log.info(f"{status_icon} Status: {time.strftime('%H:%M:%S')} - "
                   f"Idle: {idle_time:.1f}m - "
                   f"Monitoring: {'✅' if status.get('monitoring') else '❌'}")
     
@@ -304,53 +407,62 @@ class MotivateAIApp:
             signal.SIGTERM: "SIGTERM"
         }
         signal_name = signal_names.get(signum, f"Signal {signum}")
-        print(f"\n🛑 Received {signal_name} - initiating shutdown...")
+        log.info(f"🛑 Received {signal_name} - initiating shutdown...")
         self.running = False
+        # Leave the Tk loop now rather than waiting for the next tick
+        if self.main_window:
+            self.main_window.root.after(0, self.main_window.root.quit)
     
     def shutdown(self):
         """Gracefully shutdown the application"""
-        print("\n🔄 Shutting down Motivate.AI...")
+        log.info("🔄 Shutting down Motivate.AI...")
         
         self.running = False
         
         # Stop idle monitoring
         if self.idle_manager:
             self.idle_manager.stop()
-            print("✅ Idle monitoring stopped")
+            log.info("✅ Idle monitoring stopped")
         
         # Dismiss any active popups
         if self.popup_manager:
             self.popup_manager.dismiss_active_popups()
-            print("✅ Pop-ups dismissed")
+            log.info("✅ Pop-ups dismissed")
         
         # Stop system tray
         if self.tray_manager:
             self.tray_manager.stop()
-            print("✅ System tray stopped")
+            log.info("✅ System tray stopped")
+        
+        self.http.close()
         
         # Close main window if open
         if self.main_window and hasattr(self.main_window, 'root'):
             try:
                 self.main_window.root.quit()
                 self.main_window.root.destroy()
-                print("✅ Main window closed")
+                log.info("✅ Main window closed")
             except:
                 pass
         
-        print("👋 Motivate.AI Desktop App stopped successfully")
+        log.info("👋 Motivate.AI Desktop App stopped successfully")
         sys.exit(0)
 
 
 def main():
     """Main entry point"""
+    # Started before the app exists so its first messages print as they happen
+    listener = start_logging()
     try:
         app = MotivateAIApp()
         app.start()
     except Exception as e:
         print(f"\n💥 Fatal error: {e}")
-        import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        # Flushes queued records, also when shutdown() or an error exits
+        listener.stop()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,34 @@
+"""
+Shared HTTP session for the Motivate.AI backend
+
+Every caller talks to the same local API, so one session with a small
+connection pool keeps those connections alive between calls. Transient
+gateway errors are retried by urllib3 with backoff rather than by per-call
+retry loops. Set MOTIVATE_HTTP_DEBUG=1 to log urllib3's connection handling
+(new connections, reuse and dropped-connection resets).
+"""
+
+import logging
+import os
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def create_session() -> requests.Session:
+    """Create a session with one pooled, retrying adapter for all requests"""
+    retries = Retry(total=2, backoff_factor=0.1, status_forcelist=[502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=8, max_retries=retries)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+SESSION = create_session()
+
+if os.getenv("MOTIVATE_HTTP_DEBUG") == "1":
+    _urllib3_log = logging.getLogger("urllib3")
+    _urllib3_log.setLevel(logging.DEBUG)
+    _urllib3_log.addHandler(logging.StreamHandler())
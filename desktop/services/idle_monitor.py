@@ -5,8 +5,12 @@ Detects user idle time and triggers appropriate interventions
 when the user has been inactive for specified periods.
 """
 
+import logging
 import time
 import threading
+from bisect import bisect_left
+from collections import deque
+from datetime import datetime
 from typing import Callable, Optional
 import os
 import psutil
@@ -19,13 +23,47 @@ try:
 except ImportError:
     WINDOWS_AVAILABLE = False
 
+if WINDOWS_AVAILABLE:
+    # Bind the last-input API once; each idle check is then two C calls
+    import ctypes
+    from ctypes import wintypes
+    
+    class _LASTINPUTINFO(ctypes.Structure):
+        _fields_ = [
+            ('cbSize', wintypes.UINT),
+            ('dwTime', wintypes.DWORD),
+        ]
+    
+    _GetLastInputInfo = ctypes.windll.user32.GetLastInputInfo
+    _GetLastInputInfo.argtypes = [ctypes.POINTER(_LASTINPUTINFO)]
+    _GetLastInputInfo.restype = wintypes.BOOL
+    _GetTickCount = ctypes.windll.kernel32.GetTickCount
+    _GetTickCount.restype = wintypes.DWORD
+    
+    # Reused for every call
+    _lii_buf = _LASTINPUTINFO()
+    _lii_buf.cbSize = ctypes.sizeof(_lii_buf)
+
+# Child of the desktop app's logger, so records go through its queued handler
+logger = logging.getLogger("motivate_ai.idle_monitor")
+
+# Idle-time readings younger than this are reused
+IDLE_CACHE_SECONDS = 0.5
+# Bounds on the monitor loop's wait between idle checks, in seconds
+MIN_CHECK_DELAY = 5
+MAX_ACTIVE_CHECK_DELAY = 300
+MAX_IDLE_CHECK_DELAY = 60
+
 
 class IdleMonitor:
     def __init__(self, idle_threshold_minutes: int = 10):
         self.idle_threshold_minutes = idle_threshold_minutes
         self.idle_threshold_seconds = idle_threshold_minutes * 60
-        self.monitoring = False
         self.monitor_thread = None
+        # Set while not monitoring; setting it wakes the monitor loop to exit
+        self._stop_event = threading.Event()
+        self._stop_event.set()
+        self.check_interval = 30  # Seconds between monitor loop checks
         
         # Callbacks
         self.on_idle_detected: Optional[Callable[[int], None]] = None
@@ -33,13 +71,38 @@ class IdleMonitor:
         self.on_long_idle: Optional[Callable[[int], None]] = None
         
         # State tracking
-        self.last_activity_time = time.time()
+        # Durations are measured on the monotonic clock, immune to clock changes
+        self.last_activity_time = time.monotonic()
         self.was_idle = False
         self.idle_start_time = None
         
+        # Fallback CPU sampling: cpu_percent(None) reports usage since the
+        # previous call, so prime it now and sample at most every half interval
+        self._last_cpu_sample_ts = 0.0
+        # (monotonic timestamp, idle seconds) of the last idle-time reading
+        self._idle_cache = (0.0, 0.0)
+        # Reused by get_idle_status
+        self._status = {
+            "is_idle": False,
+            "idle_seconds": 0.0,
+            "idle_minutes": 0.0,
+            "threshold_minutes": idle_threshold_minutes,
+            "monitoring": False
+        }
+        if not WINDOWS_AVAILABLE:
+            psutil.cpu_percent(None)
+        
+        # Pick the idle-time source once; WINDOWS_AVAILABLE is fixed at import
+        self._read_idle_time = self._get_windows_idle_time if WINDOWS_AVAILABLE else self._get_fallback_idle_time
+        
         # Check system capabilities
         self.can_monitor = self._check_capabilities()
         
+    @property
+    def monitoring(self) -> bool:
+        """Whether the monitor loop is (meant to be) running"""
+        return not self._stop_event.is_set()
+    
     def _check_capabilities(self) -> bool:
         """Check if we can monitor system idle time"""
         if WINDOWS_AVAILABLE:
@@ -50,65 +113,56 @@ class IdleMonitor:
     
     def get_system_idle_time(self) -> float:
         """Get system idle time in seconds"""
-        if WINDOWS_AVAILABLE:
-            return self._get_windows_idle_time()
-        else:
-            return self._get_fallback_idle_time()
+        # Status and UI callers can ask several times in a row; answer bursts
+        # from one reading
+        now = time.monotonic()
+        cached_at, cached_idle = self._idle_cache
+        if cached_at and now - cached_at < IDLE_CACHE_SECONDS:
+            return cached_idle
+        
+        idle = self._read_idle_time()
+        self._idle_cache = (now, idle)
+        return idle
     
     def _get_windows_idle_time(self) -> float:
         """Get idle time using Windows API"""
         try:
             # Get last input info using Windows API
-            import ctypes
-            from ctypes import wintypes
-            
-            user32 = ctypes.windll.user32
-            kernel32 = ctypes.windll.kernel32
-            
-            class LASTINPUTINFO(ctypes.Structure):
-                _fields_ = [
-                    ('cbSize', wintypes.UINT),
-                    ('dwTime', wintypes.DWORD),
-                ]
-            
-            lastInputInfo = LASTINPUTINFO()
-            lastInputInfo.cbSize = ctypes.sizeof(lastInputInfo)
-            
-            if user32.GetLastInputInfo(ctypes.byref(lastInputInfo)):
-                current_time = kernel32.GetTickCount()
-                idle_time = current_time - lastInputInfo.dwTime
+            if _GetLastInputInfo(ctypes.byref(_lii_buf)):
+                # Both are 32-bit tick counts that wrap every ~49.7 days
+                idle_time = (_GetTickCount() - _lii_buf.dwTime) & 0xFFFFFFFF
                 return idle_time / 1000.0  # Convert to seconds
             else:
                 return 0.0
                 
-        except Exception as e:
-            print(f"Error getting Windows idle time: {e}")
+        except Exception:
+            logger.exception("Error getting Windows idle time")
             return self._get_fallback_idle_time()
     
     def _get_fallback_idle_time(self) -> float:
-        """Fallback method using process activity monitoring"""
+        """Fallback method using system CPU usage as a proxy for activity"""
         try:
-            # Monitor CPU usage and active processes as a proxy for activity
-            current_time = time.time()
+            current_time = time.monotonic()
             
-            # Check if there are any high-activity processes
-            high_activity_threshold = 5.0  # CPU usage percentage
+            # A recent sample is still current; idle time just keeps counting
+            # from the last activity it saw
+            if current_time - self._last_cpu_sample_ts < self.check_interval / 2:
+                return current_time - self.last_activity_time
+            self._last_cpu_sample_ts = current_time
             
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent']):
-                try:
-                    cpu_percent = proc.info['cpu_percent']
-                    if cpu_percent and cpu_percent > high_activity_threshold:
-                        # Recent activity detected
-                        self.last_activity_time = current_time
-                        return 0.0
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
+            # One system-wide sample (a single /proc/stat read) instead of
+            # scanning every process
+            high_activity_threshold = 5.0  # CPU usage percentage
+            if psutil.cpu_percent(None) > high_activity_threshold:
+                # Recent activity detected
+                self.last_activity_time = current_time
+                return 0.0
             
             # No high activity detected
             return current_time - self.last_activity_time
             
-        except Exception as e:
-            print(f"Error in fallback idle detection: {e}")
+        except Exception:
+            logger.exception("Error in fallback idle detection")
             return 0.0
     
     def start_monitoring(self):
@@ -117,10 +171,10 @@ class IdleMonitor:
             return
             
         if not self.can_monitor:
-            print("Warning: Idle monitoring not fully supported on this system")
+            logger.warning("Idle monitoring not fully supported on this system")
             return
         
-        self.monitoring = True
+        self._stop_event.clear()
         # Create thread with more explicit settings for stability
         self.monitor_thread = threading.Thread(
             target=self._monitor_loop, 
@@ -128,26 +182,26 @@ class IdleMonitor:
             name="IdleMonitor"
         )
         self.monitor_thread.start()
-        print(f"Idle monitoring started (threshold: {self.idle_threshold_minutes} minutes)")
+        logger.info("Idle monitoring started (threshold: %s minutes)", self.idle_threshold_minutes)
     
     def stop_monitoring(self):
         """Stop idle time monitoring"""
-        self.monitoring = False
+        self._stop_event.set()
         if self.monitor_thread and self.monitor_thread.is_alive():
             try:
                 self.monitor_thread.join(timeout=2)
                 if self.monitor_thread.is_alive():
-                    print("Warning: Monitor thread did not stop cleanly")
-            except Exception as e:
-                print(f"Error stopping monitor thread: {e}")
-        print("Idle monitoring stopped")
+                    logger.warning("Monitor thread did not stop cleanly")
+            except Exception:
+                logger.exception("Error stopping monitor thread")
+        logger.info("Idle monitoring stopped")
     
     def _monitor_loop(self):
         """Main monitoring loop - thread-safe version"""
-        check_interval = 30  # Check every 30 seconds
+        check_interval = self.check_interval
         long_idle_threshold = self.idle_threshold_seconds * 3  # 3x the normal threshold
         
-        while self.monitoring:
+        while not self._stop_event.is_set():
             try:
                 current_idle_time = self.get_system_idle_time()
                 idle_minutes = current_idle_time / 60
@@ -155,47 +209,58 @@ class IdleMonitor:
                 # Check for initial idle state
                 if not self.was_idle and current_idle_time >= self.idle_threshold_seconds:
                     self.was_idle = True
-                    self.idle_start_time = time.time() - current_idle_time
+                    self.idle_start_time = time.monotonic() - current_idle_time
                     
-                    print(f"Idle detected: {idle_minutes:.1f} minutes")
+                    logger.info("Idle detected: %.1f minutes", idle_minutes)
                     
                     # Use thread-safe callback execution
                     if self.on_idle_detected:
                         try:
                             self.on_idle_detected(int(idle_minutes))
-                        except Exception as callback_error:
-                            print(f"Error in idle callback: {callback_error}")
+                        except Exception:
+                            logger.exception("Error in idle callback")
                 
                 # Check for long idle periods
                 elif self.was_idle and current_idle_time >= long_idle_threshold:
                     if self.on_long_idle:
                         try:
                             self.on_long_idle(int(idle_minutes))
-                        except Exception as callback_error:
-                            print(f"Error in long idle callback: {callback_error}")
+                        except Exception:
+                            logger.exception("Error in long idle callback")
                 
                 # Check for activity resumption
                 elif self.was_idle and current_idle_time < self.idle_threshold_seconds:
                     self.was_idle = False
                     self.idle_start_time = None
                     
-                    print("Activity resumed")
+                    logger.info("Activity resumed")
                     
                     if self.on_activity_resumed:
                         try:
                             self.on_activity_resumed()
-                        except Exception as callback_error:
-                            print(f"Error in activity resumed callback: {callback_error}")
+                        except Exception:
+                            logger.exception("Error in activity resumed callback")
                 
-                time.sleep(check_interval)
+                self._stop_event.wait(self._next_check_delay(current_idle_time, long_idle_threshold))
                 
-            except Exception as e:
-                print(f"Error in idle monitoring loop: {e}")
+            except Exception:
+                logger.exception("Error in idle monitoring loop")
                 # Continue monitoring even if there's an error
-                try:
-                    time.sleep(check_interval)
-                except:
-                    break  # Exit if we can't even sleep
+                self._stop_event.wait(check_interval)
+    
+    def _next_check_delay(self, idle_seconds: float, long_idle_threshold: float) -> float:
+        """Seconds until the next idle check is worth doing"""
+        if self.was_idle:
+            # Activity can resume at any moment; also wake for the long-idle mark
+            until_long_idle = long_idle_threshold - idle_seconds
+            if 0 < until_long_idle < MAX_IDLE_CHECK_DELAY:
+                delay = until_long_idle
+            else:
+                delay = MAX_IDLE_CHECK_DELAY
+        else:
+            # An active user can't reach the threshold any sooner than this
+            delay = min(self.idle_threshold_seconds - idle_seconds, MAX_ACTIVE_CHECK_DELAY)
+        return max(delay, MIN_CHECK_DELAY)
     
     def get_current_idle_time(self) -> float:
         """Get current idle time in minutes"""
@@ -209,19 +274,23 @@ class IdleMonitor:
         """Set new idle threshold"""
         self.idle_threshold_minutes = minutes
         self.idle_threshold_seconds = minutes * 60
-        print(f"Idle threshold set to {minutes} minutes")
+        logger.info("Idle threshold set to %s minutes", minutes)
     
     def get_idle_status(self) -> dict:
-        """Get current idle status information"""
+        """Get current idle status information
+        
+        The same dict is updated and returned on every call; copy it to keep
+        a snapshot.
+        """
         current_idle = self.get_system_idle_time()
         
-        return {
-            "is_idle": current_idle >= self.idle_threshold_seconds,
-            "idle_seconds": current_idle,
-            "idle_minutes": current_idle / 60,
-            "threshold_minutes": self.idle_threshold_minutes,
-            "monitoring": self.monitoring
-        }
+        status = self._status
+        status["is_idle"] = current_idle >= self.idle_threshold_seconds
+        status["idle_seconds"] = current_idle
+        status["idle_minutes"] = current_idle / 60
+        status["threshold_minutes"] = self.idle_threshold_minutes
+        status["monitoring"] = self.monitoring
+        return status
 
 
 class SmartIdleManager:
@@ -230,7 +299,10 @@ class SmartIdleManager:
     def __init__(self, popup_manager=None):
         self.idle_monitor = IdleMonitor()
         self.popup_manager = popup_manager
-        self.intervention_history = []
+        # Only the last 50 interventions are kept
+        self.intervention_history = deque(maxlen=50)
+        # mono_ts of each history entry, oldest first, for bisecting by age
+        self._intervention_times = deque(maxlen=50)
         
         # Smart intervention settings
         self.settings = {
@@ -240,6 +312,9 @@ class SmartIdleManager:
             "max_interventions_per_hour": 3
         }
         
+        # Reused by get_status; kept apart from the monitor's own status dict
+        self._status = {}
+        
         # Set up callbacks
         self.idle_monitor.on_idle_detected = self.handle_idle_detected
         self.idle_monitor.on_activity_resumed = self.handle_activity_resumed
@@ -255,7 +330,7 @@ class SmartIdleManager:
     
     def handle_idle_detected(self, idle_minutes: int):
         """Handle when idle state is first detected"""
-        print(f"Smart idle manager: User idle for {idle_minutes} minutes")
+        logger.info("Smart idle manager: User idle for %s minutes", idle_minutes)
         
         if self.should_intervene():
             if idle_minutes >= self.settings["gentle_threshold_minutes"]:
@@ -263,7 +338,7 @@ class SmartIdleManager:
     
     def handle_activity_resumed(self):
         """Handle when user becomes active again"""
-        print("Smart idle manager: User activity resumed")
+        logger.info("Smart idle manager: User activity resumed")
         
         # Could trigger a "welcome back" or progress check
         if self.popup_manager:
@@ -272,7 +347,7 @@ class SmartIdleManager:
     
     def handle_long_idle(self, idle_minutes: int):
         """Handle extended idle periods"""
-        print(f"Smart idle manager: Extended idle period - {idle_minutes} minutes")
+        logger.info("Smart idle manager: Extended idle period - %s minutes", idle_minutes)
         
         if idle_minutes >= self.settings["break_threshold_minutes"]:
             self.suggest_break_activities()
@@ -281,15 +356,13 @@ class SmartIdleManager:
     
     def should_intervene(self) -> bool:
         """Check if we should intervene based on history and settings"""
-        from datetime import datetime, timedelta
-        
         # Check intervention frequency
-        recent_interventions = [
-            i for i in self.intervention_history
-            if (datetime.now() - i["timestamp"]) < timedelta(hours=1)
-        ]
-        
-        return len(recent_interventions) < self.settings["max_interventions_per_hour"]
+        return self._recent_intervention_count() < self.settings["max_interventions_per_hour"]
+    
+    def _recent_intervention_count(self) -> int:
+        """Number of interventions in the last hour"""
+        cutoff = time.monotonic() - 3600
+        return len(self._intervention_times) - bisect_left(self._intervention_times, cutoff)
     
     def trigger_gentle_intervention(self, idle_minutes: int):
         """Trigger a gentle nudge intervention"""
@@ -313,31 +386,27 @@ class SmartIdleManager:
     
     def log_intervention(self, intervention_type: str, data: dict):
         """Log intervention for learning and frequency control"""
-        from datetime import datetime
-        
+        mono_ts = time.monotonic()
         self.intervention_history.append({
-            "timestamp": datetime.now(),
+            "timestamp": datetime.now(),  # Wall clock, for display
+            "mono_ts": mono_ts,
             "type": intervention_type,
             "data": data
         })
-        
-        # Keep only last 50 interventions
-        if len(self.intervention_history) > 50:
-            self.intervention_history = self.intervention_history[-50:]
+        self._intervention_times.append(mono_ts)
     
     def get_status(self) -> dict:
-        """Get current idle monitoring status"""
-        idle_status = self.idle_monitor.get_idle_status()
+        """Get current idle monitoring status
         
-        return {
-            **idle_status,
-            "smart_monitoring": True,
-            "recent_interventions": len([
-                i for i in self.intervention_history
-                if (time.time() - i["timestamp"].timestamp()) < 3600
-            ]),
-            "settings": self.settings
-        }
+        The same dict is updated and returned on every call; copy it to keep
+        a snapshot.
+        """
+        status = self._status
+        status.update(self.idle_monitor.get_idle_status())
+        status["smart_monitoring"] = True
+        status["recent_interventions"] = self._recent_intervention_count()
+        status["settings"] = self.settings
+        return status
 
 
 # Global instances
@@ -359,6 +428,8 @@ def get_smart_idle_manager(popup_manager=None) -> SmartIdleManager:
     return _smart_idle_manager
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     # Test the idle monitor
     monitor = IdleMonitor(idle_threshold_minutes=1)  # 1 minute for testing
     
@@ -7,11 +7,18 @@ and intelligent notifications.
 
 import pystray
 import requests
+from concurrent.futures import Future, ThreadPoolExecutor
 from PIL import Image, ImageDraw
 from threading import Thread
 import os
 import time
-from typing import Optional, Callable
+from typing import Dict, Optional, Callable, Tuple
+
+from services.http import SESSION
+
+# Backend responses are reused for this long, so repeated menu clicks
+# don't hit the API again
+_RESPONSE_CACHE_SECONDS = 5
 
 
 class TrayManager:
@@ -20,12 +27,23 @@ class TrayManager:
         self.api_base_url = os.getenv("API_BASE_URL", "http://127.0.0.1:8010/api/v1")
         self.tray_icon = None
         self.running = False
+        # API path -> (fetched_at, response) for _get_cached
+        self._cache: Dict[str, Tuple[float, requests.Response]] = {}
+        # Menu handlers fetch from the backend here, keeping the menu responsive
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tray-http")
         
-        # Create tray icon
-        self.create_icon()
+        # Render both icon states once; they never change
+        self._icon_plain = self._build_icon(False)
+        self._icon_notify = self._build_icon(True)
+        # State the tray icon was last set to (start() shows the plain icon)
+        self._current_has_notifications = False
         
     def create_icon(self):
-        """Create a simple tray icon"""
+        """Return the tray icon image"""
+        return self._icon_plain
+    
+    def _build_icon(self, notify: bool):
+        """Draw the tray icon, with a red notification dot if notify is set"""
         # Create a simple icon with a circle and "M" for Motivate
         width, height = 64, 64
         image = Image.new('RGBA', (width, height), (0, 0, 0, 0))
@@ -45,6 +63,10 @@ class TrayManager:
         
         draw.text((text_x, text_y), "M", fill=(255, 255, 255, 255))
         
+        if notify:
+            # Add a small red dot for notifications
+            draw.ellipse([45, 10, 55, 20], fill=(231, 76, 60, 255))
+        
         return image
     
     def create_menu(self):
@@ -115,6 +137,7 @@ class TrayManager:
     def stop(self):
         """Stop the system tray icon"""
         self.running = False
+        self._executor.shutdown(wait=False, cancel_futures=True)
         if self.tray_icon:
             self.tray_icon.stop()
     
@@ -122,16 +145,32 @@ class TrayManager:
         """Update the tray icon to show notification state"""
         if not self.tray_icon:
             return
+        # Setting .icon redraws the tray entry, so skip it when nothing changed
+        if has_notifications == self._current_has_notifications:
+            return
             
-        # Create icon with notification indicator if needed
-        icon_image = self.create_icon()
-        
-        if has_notifications:
-            # Add a small red dot for notifications
-            draw = ImageDraw.Draw(icon_image)
-            draw.ellipse([45, 10, 55, 20], fill=(231, 76, 60, 255))
-        
-        self.tray_icon.icon = icon_image
+        self.tray_icon.icon = self._icon_notify if has_notifications else self._icon_plain
+        self._current_has_notifications = has_notifications
+    
+    def _get_cached(self, path: str) -> requests.Response:
+        """GET an API path over the shared session, reusing a recent response"""
+        now = time.monotonic()
+        cached = self._cache.get(path)
+        if cached and now - cached[0] < _RESPONSE_CACHE_SECONDS:
+            return cached[1]
+        # Short timeouts: a local backend answers at once or isn't running
+        response = SESSION.get(f"{self.api_base_url}{path}", timeout=(0.5, 2.0))
+        self._cache[path] = (now, response)
+        return response
+    
+    def _notify_when_done(self, fetch: Callable[[], Tuple[str, str]]):
+        """Run fetch on the worker thread and show its (title, message) when ready"""
+        future = self._executor.submit(fetch)
+        future.add_done_callback(self._show_fetched_notification)
+    
+    def _show_fetched_notification(self, future: Future):
+        if not future.cancelled():
+            self.show_notification(*future.result())
     
     def show_notification(self, title: str, message: str, duration: int = 5):
         """Show a system notification"""
@@ -173,9 +212,13 @@ class TrayManager:
     
     def show_next_suggestion(self, icon=None, item=None):
         """Show the next AI suggestion"""
+        self._notify_when_done(self._fetch_suggestion)
+    
+    def _fetch_suggestion(self) -> Tuple[str, str]:
+        """Get the next suggestion as a (title, message) notification"""
         try:
             # Try to get suggestion from backend
-            response = requests.get(f"{self.api_base_url}/suggestions/next", timeout=5)
+            response = self._get_cached("/suggestions/next")
             if response.status_code == 200:
                 suggestion = response.json()
                 title = "AI Suggestion"
@@ -187,13 +230,17 @@ class TrayManager:
             title = "Demo Suggestion"
             message = "Try organizing one drawer in your workshop (5 minutes)"
         
-        self.show_notification(title, message)
+        return title, message
     
     def show_progress(self, icon=None, item=None):
         """Show today's progress summary"""
+        self._notify_when_done(self._fetch_progress)
+    
+    def _fetch_progress(self) -> Tuple[str, str]:
+        """Get today's progress as a (title, message) notification"""
         try:
             # Try to get progress from backend
-            response = requests.get(f"{self.api_base_url}/progress/today", timeout=5)
+            response = self._get_cached("/progress/today")
             if response.status_code == 200:
                 progress = response.json()
                 completed = progress.get("completed", 0)
@@ -204,7 +251,7 @@ class TrayManager:
         except:
             message = "Demo: 3/5 tasks completed today ✅"
         
-        self.show_notification("Today's Progress", message)
+        return "Today's Progress", message
     
     def show_settings(self, icon=None, item=None):
         """Open settings window"""
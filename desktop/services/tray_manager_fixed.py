@@ -25,8 +25,9 @@ class TrayManager:
         self.restart_attempts = 0
         self.max_restart_attempts = 3
         
-        # Thread-safe communication queue
-        self.action_queue = queue.Queue()
+        # Thread-safe communication queue; SimpleQueue has no task tracking
+        # so put/get are cheaper than queue.Queue
+        self.action_queue = queue.SimpleQueue()
         
     def create_icon(self):
         """Create a simple tray icon"""
@@ -157,13 +158,16 @@ class TrayManager:
             except Exception as e:
                 print(f"Error joining tray thread: {e}")
     
-    def get_pending_actions(self):
-        """Get any pending actions from the queue (thread-safe)"""
+    def get_pending_actions(self, max_actions: int = 32):
+        """Get up to max_actions pending actions from the queue (thread-safe)
+        
+        Anything beyond max_actions stays queued for the next call, so a burst
+        of clicks can't stall the caller.
+        """
         actions = []
-        while True:
+        while len(actions) < max_actions:
             try:
-                action = self.action_queue.get_nowait()
-                actions.append(action)
+                actions.append(self.action_queue.get_nowait())
             except queue.Empty:
                 break
         return actions
@@ -0,0 +1,129 @@
+import pytest
+import ctypes
+import sys
+import os
+import time
+import types
+from unittest.mock import patch
+
+# Add the desktop directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# The monitor only needs psutil for its CPU-usage fallback; a stub keeps these
+# tests independent of the real package and of the machine's load
+psutil_stub = types.ModuleType("psutil")
+psutil_stub.cpu_percent = lambda interval=None: 0.0
+
+with patch.dict(sys.modules, {"psutil": psutil_stub}):
+    from services import idle_monitor
+    from services.idle_monitor import (
+        IdleMonitor, SmartIdleManager,
+        MIN_CHECK_DELAY, MAX_ACTIVE_CHECK_DELAY, MAX_IDLE_CHECK_DELAY
+    )
+
+
+@pytest.fixture
+def monitor():
+    """An idle monitor with a 10 minute threshold (long idle at 30 minutes)"""
+    monitor = IdleMonitor(idle_threshold_minutes=10)
+    yield monitor
+    monitor.stop_monitoring()
+
+
+LONG_IDLE = 30 * 60
+
+
+class TestNextCheckDelay:
+    """Test suite for the monitor loop's adaptive wait"""
+
+    def test_active_far_from_threshold_is_capped(self, monitor):
+        """Test an active user far from the threshold waits at most MAX_ACTIVE_CHECK_DELAY"""
+        monitor.was_idle = False
+        assert monitor._next_check_delay(0, LONG_IDLE) == MAX_ACTIVE_CHECK_DELAY
+
+    def test_active_waits_until_threshold(self, monitor):
+        """Test an active user is next checked when the threshold could first be reached"""
+        monitor.was_idle = False
+        assert monitor._next_check_delay(600 - 120, LONG_IDLE) == 120
+
+    def test_active_near_threshold_is_floored(self, monitor):
+        """Test the wait never drops below MIN_CHECK_DELAY"""
+        monitor.was_idle = False
+        assert monitor._next_check_delay(600 - 1, LONG_IDLE) == MIN_CHECK_DELAY
+        assert monitor._next_check_delay(700, LONG_IDLE) == MIN_CHECK_DELAY
+
+    def test_idle_far_from_long_idle_is_capped(self, monitor):
+        """Test an idle user is rechecked at most every MAX_IDLE_CHECK_DELAY"""
+        monitor.was_idle = True
+        assert monitor._next_check_delay(600, LONG_IDLE) == MAX_IDLE_CHECK_DELAY
+
+    def test_idle_wakes_for_long_idle_mark(self, monitor):
+        """Test an idle user close to the long-idle mark is checked right at it"""
+        monitor.was_idle = True
+        assert monitor._next_check_delay(LONG_IDLE - 20, LONG_IDLE) == 20
+        assert monitor._next_check_delay(LONG_IDLE - 2, LONG_IDLE) == MIN_CHECK_DELAY
+
+    def test_past_long_idle_uses_idle_cap(self, monitor):
+        """Test once past the long-idle mark the wait goes back to MAX_IDLE_CHECK_DELAY"""
+        monitor.was_idle = True
+        assert monitor._next_check_delay(LONG_IDLE + 1, LONG_IDLE) == MAX_IDLE_CHECK_DELAY
+
+
+class TestIdleMonitor:
+    """Test suite for idle monitor threading and Windows idle time"""
+
+    def test_stop_monitoring_returns_promptly(self, monitor):
+        """Test stopping wakes the loop from its wait instead of sleeping it out"""
+        monitor.start_monitoring()
+        assert monitor.monitoring
+
+        started = time.monotonic()
+        monitor.stop_monitoring()
+
+        assert time.monotonic() - started < 1
+        assert not monitor.monitor_thread.is_alive()
+        assert not monitor.monitoring
+
+    def test_windows_idle_time_handles_tick_wraparound(self, monitor, monkeypatch):
+        """Test idle time stays correct when GetTickCount wraps past 2**32"""
+        class LastInputInfo(ctypes.Structure):
+            _fields_ = [("cbSize", ctypes.c_uint32), ("dwTime", ctypes.c_uint32)]
+
+        # Last input 1s before the wrap, now 2s after it
+        buf = LastInputInfo(ctypes.sizeof(LastInputInfo), 0xFFFFFFFF - 999)
+        monkeypatch.setattr(idle_monitor, "ctypes", ctypes, raising=False)
+        monkeypatch.setattr(idle_monitor, "_lii_buf", buf, raising=False)
+        monkeypatch.setattr(idle_monitor, "_GetLastInputInfo", lambda ref: True, raising=False)
+        monkeypatch.setattr(idle_monitor, "_GetTickCount", lambda: 2000, raising=False)
+
+        assert monitor._get_windows_idle_time() == pytest.approx(3.0)
+
+
+class TestSmartIdleManager:
+    """Test suite for intervention frequency tracking"""
+
+    def test_recent_count_is_bounded_by_history(self):
+        """Test only the last 50 interventions are kept and counted"""
+        manager = SmartIdleManager()
+        for _ in range(60):
+            manager.log_intervention("gentle_nudge", {"idle_minutes": 10})
+
+        assert len(manager.intervention_history) == 50
+        assert manager._recent_intervention_count() == 50
+        assert manager.should_intervene() is False
+
+    def test_interventions_older_than_an_hour_are_not_counted(self, monkeypatch):
+        """Test interventions drop out of the recent count after an hour"""
+        manager = SmartIdleManager()
+        now = time.monotonic()
+        monkeypatch.setattr(idle_monitor.time, "monotonic", lambda: now)
+        manager.log_intervention("gentle_nudge", {"idle_minutes": 10})
+        monkeypatch.setattr(idle_monitor.time, "monotonic", lambda: now + 1800)
+        manager.log_intervention("task_suggestion", {"idle_minutes": 20})
+
+        assert manager._recent_intervention_count() == 2
+
+        monkeypatch.setattr(idle_monitor.time, "monotonic", lambda: now + 3601)
+        assert manager._recent_intervention_count() == 1
+        assert manager.get_status()["recent_interventions"] == 1
+        assert manager.should_intervene() is True
@@ -8,7 +8,6 @@ Features responsive design, resizable project sidebar, and task management.
 import customtkinter as ctk
 import tkinter as tk
 from typing import Dict, List, Optional
-import requests
 import os
 import threading
 from datetime import datetime, date
@@ -20,13 +19,15 @@ ctk.set_appearance_mode("light")  # "light" or "dark" or "system"
 ctk.set_default_color_theme("blue")  # "blue", "green", or "dark-blue"
 
 class MainWindow:
-    def __init__(self):
+    def __init__(self, lazy: bool = False):
+        """Create the window; with lazy=True the widgets are built on first show"""
         self.api_base_url = os.getenv("API_BASE_URL", "http://127.0.0.1:8010/api/v1")
         self.projects = []
         self.tasks = []
         self.selected_project = None
         self.selected_project_id = None
         self.pending_updates = []  # Store updates when window isn't ready
+        self._updates_scheduled = False  # A drain of pending_updates is queued in Tk
         
         # Load settings first
         self.load_and_apply_settings()
@@ -43,6 +44,12 @@ class MainWindow:
         self.root.geometry("1450x900")
         self.root.minsize(800, 600)
         
+        self.ui_built = False
+        if not lazy:
+            self.build_ui()
+    
+    def build_ui(self):
+        """Build the widget tree and start loading projects"""
         # Cache fonts for performance AFTER root window is created
         self.font_cache = self._build_font_cache()
         
@@ -58,6 +65,7 @@ class MainWindow:
         
         # Load projects immediately (no async needed since window shows instantly)
         self.load_projects_data()
+        self.ui_built = True
     
     def _build_color_cache(self):
         """Build cache of frequently used colors for performance"""
@@ -198,6 +206,7 @@ class MainWindow:
         
         # Load real projects from API in background
         def load_projects_async():
+            import requests
             try:
                 response = requests.get(f"{self.api_base_url}/projects", timeout=10)
                 if response.status_code == 200:
@@ -234,8 +243,15 @@ class MainWindow:
                 # Store the update for later as fallback
                 self.pending_updates.append(callback)
     
+    def schedule_pending_updates(self):
+        """Queue one drain of pending updates for Tk's next idle moment"""
+        if self.pending_updates and not self._updates_scheduled:
+            self._updates_scheduled = True
+            self.root.after_idle(self.process_pending_updates)
+    
     def process_pending_updates(self):
         """Process pending UI updates with throttling to prevent blocking"""
+        self._updates_scheduled = False
         # Process maximum 5 updates at a time to prevent UI blocking
         max_updates_per_cycle = 5
         processed = 0
@@ -251,16 +267,19 @@ class MainWindow:
         
         # If more updates remain, schedule them for next cycle
         if self.pending_updates:
+            self._updates_scheduled = True
             self.root.after(10, self.process_pending_updates)
     
     def show_window(self):
         """Show the main window and process any pending updates"""
         if self.root:
+            if not self.ui_built:
+                self.build_ui()
             self.root.deiconify()
             self.root.lift()
             self.root.focus_force()
             # Process any updates that were waiting
-            self.process_pending_updates()
+            self.schedule_pending_updates()
     
     def update_projects_from_api(self, real_projects):
         """Update projects with real data from API (called on main thread)"""
@@ -749,6 +768,7 @@ class MainWindow:
     
     def save_task(self):
         """Save the current task (new or edited)"""
+        import requests
         # Get form data
         title = self.title_entry.get().strip()
         description = self.get_description_text()
@@ -926,6 +946,7 @@ class MainWindow:
 
         # Load real tasks from backend in background thread
         def load_tasks_async():
+            import requests
             try:
                 print(f"DEBUG: Fetching tasks from API for project {project_id}")
                 response = requests.get(f"{self.api_base_url}/tasks?project_id={project_id}", timeout=10)
@@ -1419,6 +1440,7 @@ class MainWindow:
     
     def toggle_task_completion(self, task):
         """Toggle task completion status"""
+        import requests
         current_status = task.get("status", "pending")
         new_status = "completed" if current_status != "completed" else "pending"
         
@@ -1461,6 +1483,7 @@ class MainWindow:
     
     def delete_task(self, task):
         """Delete a task with confirmation dialog"""
+        import requests
         import tkinter.messagebox as msgbox
         
         task_title = task.get("title", "Untitled Task")
@@ -1502,6 +1525,7 @@ class MainWindow:
     
     def delete_project(self, project):
         """Delete a project with confirmation dialog"""
+        import requests
         import tkinter.messagebox as msgbox
         
         project_title = project.get("title", "Untitled Project")
@@ -1873,6 +1897,7 @@ class MainWindow:
             
             # Execute in background thread to avoid blocking UI
             def execute_changes():
+                import requests
                 try:
                     response = requests.post(f"{self.api_base_url}/ai-agent/execute/{preview_id}", 
                                            timeout=600)
@@ -2017,6 +2042,7 @@ class MainWindow:
     def check_ai_status_background(self):
         """Check AI status in background and update indicator"""
         def check_status():
+            import requests
             try:
                 response = requests.get(f"{self.api_base_url}/ai-agent/status", timeout=300)
                 if response.status_code == 200:
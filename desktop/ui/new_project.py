@@ -6,7 +6,6 @@ matching the backend API schema.
 """
 
 import os
-import requests
 import customtkinter as ctk
 from tkinter import messagebox
 from typing import Callable, Optional, Dict, Any
@@ -313,6 +312,7 @@ class NewProjectDialog:
     
     def create_project(self):
         """Create the project via API call"""
+        import requests
         if not self.validate_form():
             return
         
@@ -362,6 +362,7 @@ class NewProjectDialog:
     
     def create_tasks_for_project(self, project_id: int, tasks_list: list, project_priority: str):
         """Create tasks for the project using the bulk task creation API"""
+        import requests
         try:
             # Prepare task data for bulk creation
             bulk_tasks_data = {